@@ -0,0 +1,136 @@
+import argparse
+import contextlib
+import glob
+import io
+import os
+import re
+import timeit
+from bs4 import BeautifulSoup
+from nec_parser import parse_result_html
+
+# --- 결과 테이블 파서 마이크로 벤치마크 ---
+# 기존 BeautifulSoup 구현(아래 parse_result_html_bs4)과 nec_parser의 lxml 구현을
+# 녹화된 fixture에 대해 실행해 결과가 같은지 확인하고 소요 시간을 비교합니다.
+# 사용법: python scripts/bench_parser.py [--scale 50] [--number 20]
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BENCH_TIMESTAMP = "2025-04-02T12:00:00+00:00"
+
+
+def parse_result_html_bs4(html, execution_timestamp):
+    """scrape_push.py Step 7에 있던 BeautifulSoup 기반 파싱 로직 (비교 기준용, 로그 출력 제외)."""
+    soup = BeautifulSoup(html, "lxml")
+    candidate_names = []
+    tbody = soup.find("tbody")
+    if not tbody: raise ValueError("Parsing Error: Could not find <tbody> in the table HTML.")
+    first_tr_in_tbody = tbody.find("tr")
+    if not first_tr_in_tbody:
+        raise ValueError("Parsing Error: Could not find the first row in <tbody> for candidate names.")
+    for td_cand in first_tr_in_tbody.find_all("td", class_="alignC"):
+        strong_tag = td_cand.find("strong")
+        if strong_tag:
+            name = strong_tag.get_text(strip=True)
+            if name == "계":
+                break
+            if name:
+                candidate_names.append(name)
+    if not candidate_names:
+        raise ValueError("Critical Parsing Error: Candidate names could not be extracted from the first row of <tbody>.")
+
+    sigungu_data_list = []
+    summary_row_data = {}
+    data_rows = tbody.find_all("tr")
+    if len(data_rows) < 2:
+        raise ValueError("Parsing Error: Not enough rows in tbody to get summary and data.")
+
+    summary_row_values = [td.get_text(strip=True) for td in data_rows[1].find_all("td")]
+    if summary_row_values and summary_row_values[0] == "합계":
+        summary_row_data["구시군명"] = summary_row_values[0]
+        summary_row_data["선거인수"] = summary_row_values[1]
+        summary_row_data["투표수"] = summary_row_values[2]
+        for i, cand_name in enumerate(candidate_names):
+            summary_row_data[cand_name] = summary_row_values[3 + i]
+        summary_idx_offset = 3 + len(candidate_names)
+        if len(summary_row_values) > summary_idx_offset:
+            summary_row_data["후보자계"] = summary_row_values[summary_idx_offset]
+        if len(summary_row_values) > summary_idx_offset + 1:
+            summary_row_data["무효투표수"] = summary_row_values[summary_idx_offset + 1]
+        if len(summary_row_values) > summary_idx_offset + 2:
+            summary_row_data["기권수"] = summary_row_values[summary_idx_offset + 2]
+        if len(summary_row_values) > summary_idx_offset + 3:
+            summary_row_data["개표율"] = summary_row_values[summary_idx_offset + 3]
+
+    for tr_idx in range(3, len(data_rows), 2):
+        row_values_text = [td.get_text(strip=True) for td in data_rows[tr_idx].find_all("td")]
+        if not row_values_text or not row_values_text[0] or not row_values_text[1].replace(',','').isdigit():
+            continue
+        expected_min_cols = 3 + len(candidate_names) + 3
+        if len(row_values_text) < expected_min_cols:
+            continue
+        entry = {}
+        entry["구시군명"] = row_values_text[0]
+        entry["선거인수"] = row_values_text[1]
+        entry["투표수"] = row_values_text[2]
+        for i, cand_name in enumerate(candidate_names):
+            entry[cand_name] = row_values_text[3 + i]
+        current_idx = 3 + len(candidate_names)
+        entry["후보자계"] = row_values_text[current_idx]
+        entry["무효투표수"] = row_values_text[current_idx + 1]
+        entry["기권수"] = row_values_text[current_idx + 2]
+        if len(row_values_text) > current_idx + 3:
+            entry["개표율"] = row_values_text[current_idx + 3]
+        sigungu_data_list.append(entry)
+
+    if not sigungu_data_list:
+        raise ValueError("Parsing Error: No valid sigungu data rows processed after filtering.")
+    return {
+        "timestamp": execution_timestamp,
+        "candidates": candidate_names,
+        "data": sigungu_data_list,
+        "summary": summary_row_data
+    }
+
+
+def scale_fixture(html, factor):
+    """합계 뒤의 (숫자 행, 득표율 행) 쌍을 factor배로 복제해 읍면동 단위 크기의 테이블을 흉내냅니다."""
+    tbody = re.search(r"<tbody>(.*)</tbody>", html, flags=re.S)
+    rows = re.findall(r"<tr\b.*?</tr>", tbody.group(1), flags=re.S) if tbody else []
+    if factor <= 1 or len(rows) < 4:
+        return html
+    body = "\n".join(rows[:3] + rows[3:] * factor)
+    return re.sub(r"<tbody>.*</tbody>", lambda _: f"<tbody>\n{body}\n</tbody>", html, flags=re.S)
+
+
+def run_quietly(func, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BeautifulSoup 파서와 lxml 파서의 결과/속도를 비교합니다.")
+    parser.add_argument("--scale", type=int, default=50, help="구시군 행을 몇 배로 복제할지 (기본 50).")
+    parser.add_argument("--number", type=int, default=20, help="측정 반복 횟수 (기본 20).")
+    args = parser.parse_args()
+
+    fixture_paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    if not fixture_paths:
+        raise SystemExit(f"No fixtures found in {FIXTURE_DIR}")
+
+    for path in fixture_paths:
+        with open(path, encoding="utf-8") as f:
+            original_html = f.read()
+        for label, html in (("recorded", original_html), (f"x{args.scale}", scale_fixture(original_html, args.scale))):
+            expected = parse_result_html_bs4(html, BENCH_TIMESTAMP)
+            actual = run_quietly(parse_result_html, html, BENCH_TIMESTAMP)
+            actual.pop("table") # 기존 구현에는 없는 정수형 열 단위 테이블
+            if actual != expected:
+                raise SystemExit(f"Output mismatch for {os.path.basename(path)} ({label})")
+
+            bs4_time = timeit.timeit(lambda: parse_result_html_bs4(html, BENCH_TIMESTAMP), number=args.number) / args.number
+            lxml_time = timeit.timeit(lambda: run_quietly(parse_result_html, html, BENCH_TIMESTAMP), number=args.number) / args.number
+            print(f"{os.path.basename(path)} [{label}, {len(expected['data'])} rows]: "
+                  f"bs4 {bs4_time * 1000:.2f}ms, lxml {lxml_time * 1000:.2f}ms, speedup x{bs4_time / lxml_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import hashlib
+import json
+
+# --- 스냅샷 변경 감지 ---
+# 파싱된 행의 내용 해시(fingerprint)를 이전 상태와 비교해
+# 바뀐 것이 없으면 계산/저장을 건너뛰고, 일부 구시군만 바뀌었으면 그 행들만 delta로 내보냅니다.
+# 상태 형태: {"version": int, "fingerprints": {지역코드: 해시}, "rows": {지역코드: {구시군명: 해시}},
+#            "candidates": {지역코드: [후보자명]}}
+
+
+def _digest(value):
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def fingerprint_region(region_data):
+    """한 지역의 후보자, 구시군 행, 합계를 묶은 해시. timestamp는 포함하지 않습니다."""
+    return _digest([region_data.get("candidates"), region_data.get("data"), region_data.get("summary")])
+
+
+def fingerprint_rows(region_data):
+    """구시군명별 행 해시. 상태 크기를 줄이기 위해 앞 16자리만 사용합니다."""
+    return {row.get("구시군명"): _digest(row)[:16] for row in region_data.get("data", [])}
+
+
+def empty_state():
+    return {"version": 0, "fingerprints": {}, "rows": {}, "candidates": {}}
+
+
+def detect_changes(previous_state, regions):
+    """
+    이전 상태와 새 지역별 데이터를 비교합니다.
+    반환값: (new_state, delta). 바뀐 지역이 없으면 delta는 None이고 new_state는 이전 상태 그대로입니다.
+    이번에 수집되지 않은 지역은 이전 해시를 유지합니다.
+    """
+    previous_state = previous_state or empty_state()
+    previous_fingerprints = previous_state.get("fingerprints", {})
+    previous_rows = previous_state.get("rows", {})
+
+    fingerprints = dict(previous_fingerprints)
+    rows = dict(previous_rows)
+    delta_regions = {}
+    for city_code, region_data in regions.items():
+        fingerprint = fingerprint_region(region_data)
+        if previous_fingerprints.get(city_code) == fingerprint:
+            continue
+
+        new_row_fps = fingerprint_rows(region_data)
+        old_row_fps = previous_rows.get(city_code, {})
+        region_delta = {}
+        if city_code not in previous_fingerprints or region_data.get("candidates") != previous_state.get("candidates", {}).get(city_code):
+            # 처음 보는 지역이거나 후보자 구성이 바뀌면 행 단위 비교가 의미 없으므로 전체를 보냄
+            region_delta["full"] = True
+            region_delta["candidates"] = region_data.get("candidates")
+            region_delta["changed"] = {row.get("구시군명"): row for row in region_data.get("data", [])}
+        else:
+            region_delta["changed"] = {
+                row.get("구시군명"): row for row in region_data.get("data", [])
+                if old_row_fps.get(row.get("구시군명")) != new_row_fps.get(row.get("구시군명"))
+            }
+        removed = [name for name in old_row_fps if name not in new_row_fps]
+        if removed:
+            region_delta["removed"] = removed
+        region_delta["summary"] = region_data.get("summary")
+        delta_regions[city_code] = region_delta
+
+        fingerprints[city_code] = fingerprint
+        rows[city_code] = new_row_fps
+
+    if not delta_regions:
+        return previous_state, None
+
+    version = previous_state.get("version", 0) + 1
+    candidates = dict(previous_state.get("candidates", {}))
+    candidates.update({code: data.get("candidates") for code, data in regions.items()})
+    new_state = {"version": version, "fingerprints": fingerprints, "rows": rows, "candidates": candidates}
+    delta = {"version": version, "base_version": previous_state.get("version", 0), "regions": delta_regions}
+    return new_state, delta
+
+
+def count_changed_rows(previous_state, new_state):
+    """두 상태 사이에 해시가 달라졌거나 새로 생기거나 사라진 구시군 행 수 (모든 지역 합계)."""
+    previous_rows = (previous_state or empty_state()).get("rows", {})
+    changed = 0
+    for city_code, row_fps in (new_state or empty_state()).get("rows", {}).items():
+        old_row_fps = previous_rows.get(city_code, {})
+        changed += sum(1 for name, fp in row_fps.items() if old_row_fps.get(name) != fp)
+        changed += sum(1 for name in old_row_fps if name not in row_fps)
+    return changed
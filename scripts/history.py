@@ -0,0 +1,184 @@
+import argparse
+import datetime
+import json
+import zlib
+from redis_store import get_redis_client, get_redis_settings
+
+# --- 스냅샷 이력 (Redis Stream) ---
+# 저장할 때마다 파서가 만든 열 단위(columnar) 정수 테이블(region_data["table"])을 zlib으로 압축해 스트림에 XADD 합니다.
+# 엔트리 형태: {"ts": 수집 시각, "version": 버전, "payload": 압축된 JSON}
+# payload: {"v": 2, "regions": {지역코드: {"candidates", "rows", "eligible", "cast", "candidate_total", "invalid",
+#           "abstentions", "turnout", "votes", "summary", ["stale"]}}}  (wire_format v2의 지역 데이터에서 "projected"만 뺀 형태)
+# 17개 시도(구시군 약 250행, 후보 3~5명) 기준 엔트리 하나가 수 KB 수준이라
+# 1분 간격으로 하룻밤(최대 HISTORY_MAXLEN개)을 쌓아도 수 MB로 Upstash 메모리 한도에 여유가 있습니다.
+
+HISTORY_STREAM_KEY = "live_election_data_history"
+HISTORY_MAXLEN = 1440 # 1분 간격 24시간 분량. 넘치면 오래된 것부터 잘림 (MAXLEN ~)
+HISTORY_MIN_INTERVAL_SECONDS = 60 # 이보다 짧은 간격의 변경은 다음 변경이 오면 지워짐 (다운샘플링, plan_append 참고)
+HISTORY_FORMAT_VERSION = 2
+ROW_COLUMNS = ("eligible", "cast", "candidate_total", "invalid", "abstentions", "turnout")
+_V1_BASE_COLUMNS = ("eligible", "cast", "invalid") # v1 "columns"의 "선거인수", "투표수", "무효투표수"
+
+
+def encode_snapshot(region_snapshot):
+    """지역별 스냅샷을 XADD 필드(dict)로 인코딩합니다. "table"이 없는 지역은 제외합니다."""
+    regions = {}
+    for city_code, region_data in region_snapshot.get("regions", {}).items():
+        table = region_data.get("table")
+        if not table:
+            continue
+        regions[city_code] = dict(table, stale=True) if region_data.get("stale") else table
+    payload = json.dumps({"v": HISTORY_FORMAT_VERSION, "regions": regions}, ensure_ascii=False, separators=(",", ":"))
+    return {
+        "ts": region_snapshot.get("timestamp") or "",
+        "version": region_snapshot.get("version", 0),
+        "payload": zlib.compress(payload.encode("utf-8"), 9),
+    }
+
+
+def _table_from_v1(region):
+    """v1 엔트리("columns"/"values")를 v2 테이블 형태로 바꿉니다. v1에 없던 컬럼은 None."""
+    n_base = len(_V1_BASE_COLUMNS)
+    values = region.get("values", [])
+    table = {"candidates": region.get("candidates", []), "rows": region.get("rows", []), "summary": None}
+    for column in ROW_COLUMNS:
+        table[column] = [None] * len(values)
+    for idx, column in enumerate(_V1_BASE_COLUMNS):
+        table[column] = [row_values[idx] for row_values in values]
+    table["votes"] = [row_values[n_base:] for row_values in values]
+    return table
+
+
+def decode_entry(fields):
+    """XRANGE/XREVRANGE로 읽은 필드를 {"timestamp", "version", "regions"}로 되돌립니다."""
+    fields = {key.decode() if isinstance(key, bytes) else key: value for key, value in fields.items()}
+    timestamp = fields.get("ts", b"")
+    version = fields.get("version", b"0")
+    payload = json.loads(zlib.decompress(fields["payload"]).decode("utf-8"))
+    regions = payload.get("regions", {})
+    if payload.get("v", 1) < 2:
+        regions = {city_code: _table_from_v1(region) for city_code, region in regions.items()}
+    return {
+        "timestamp": timestamp.decode() if isinstance(timestamp, bytes) else timestamp,
+        "version": int(version),
+        "regions": regions,
+    }
+
+
+def should_append(change_state, now=None, min_interval_seconds=HISTORY_MIN_INTERVAL_SECONDS):
+    """마지막으로 이력에 남긴 시각(change_state["history_appended_at"])에서 min_interval_seconds가 지났는지."""
+    last = (change_state or {}).get("history_appended_at")
+    if not last:
+        return True
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    try:
+        elapsed = (now - datetime.datetime.fromisoformat(last)).total_seconds()
+    except ValueError:
+        return True
+    return elapsed >= min_interval_seconds
+
+
+def stream_entry_id(change_state, version, now):
+    """
+    명시적 스트림 ID "<ms>-<version>". ms는 직전 ID(change_state["history_last_id"])보다 작아지지 않게 맞추고,
+    버전은 항상 커지므로 ID도 항상 증가합니다.
+    """
+    ms = int(now.timestamp() * 1000)
+    last_id = (change_state or {}).get("history_last_id")
+    if last_id:
+        ms = max(ms, int(last_id.split("-")[0]))
+    return f"{ms}-{version}"
+
+
+def plan_append(change_state, version, now=None, min_interval_seconds=HISTORY_MIN_INTERVAL_SECONDS):
+    """
+    새 버전은 항상 이력에 남기고, 다운샘플링은 오래된 엔트리를 솎아내는 방식으로 합니다.
+    마지막으로 고정된 엔트리(history_appended_at) 뒤 min_interval_seconds가 지나지 않았으면 새 엔트리는 임시로 남기고
+    (history_pending_id), 다음 버전이 들어올 때 직전 임시 엔트리를 지웁니다. 그래서 스트림의 마지막은 항상 최신 버전입니다.
+    반환값: (새 엔트리 ID, 지울 엔트리 ID 목록, change_state에 반영할 필드 dict)
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    change_state = change_state or {}
+    entry_id = stream_entry_id(change_state, version, now)
+    pending_id = change_state.get("history_pending_id")
+    stale_ids = [pending_id] if pending_id else []
+    if should_append(change_state, now, min_interval_seconds):
+        fields = {"history_appended_at": now.isoformat(), "history_pending_id": None}
+    else:
+        fields = {"history_appended_at": change_state.get("history_appended_at"), "history_pending_id": entry_id}
+    fields["history_last_id"] = entry_id
+    return entry_id, stale_ids, fields
+
+
+# --- 조회 API ---
+def latest_snapshots(client, count=1):
+    """최근 count개의 스냅샷 (최신순)."""
+    return [decode_entry(fields) for _, fields in client.xrevrange(HISTORY_STREAM_KEY, count=count)]
+
+
+def iter_snapshots(client, start="-", end="+", batch_size=200):
+    """start~end 구간의 스냅샷을 오래된 순서로 배치 단위로 읽어 내보냅니다. start/end는 스트림 ID."""
+    while True:
+        entries = client.xrange(HISTORY_STREAM_KEY, min=start, max=end, count=batch_size)
+        for _, fields in entries:
+            yield decode_entry(fields)
+        if len(entries) < batch_size:
+            return
+        start = "(" + (entries[-1][0].decode() if isinstance(entries[-1][0], bytes) else entries[-1][0])
+
+
+def candidate_series(client, city_code, candidate_name, sigungu_name=None, start="-", end="+"):
+    """
+    후보자 득표수의 시간별 변화: [(timestamp, 득표수)].
+    sigungu_name을 주면 그 구시군만, 없으면 지역 내 구시군 합계입니다. 후보자가 없는 시점은 건너뜁니다.
+    """
+    series = []
+    for snapshot in iter_snapshots(client, start, end):
+        region = snapshot["regions"].get(city_code)
+        if not region or candidate_name not in region["candidates"]:
+            continue
+        col = region["candidates"].index(candidate_name)
+        values = [
+            row_votes[col] for row_name, row_votes in zip(region["rows"], region["votes"])
+            if sigungu_name is None or row_name == sigungu_name
+        ]
+        series.append((snapshot["timestamp"], sum(value for value in values if value is not None)))
+    return series
+
+
+def sigungu_series(client, city_code, sigungu_name, start="-", end="+"):
+    """구시군 한 곳의 시간별 값: [(timestamp, {"eligible", "cast", ..., "votes": {후보자명: 득표수}})]."""
+    series = []
+    for snapshot in iter_snapshots(client, start, end):
+        region = snapshot["regions"].get(city_code)
+        if not region or sigungu_name not in region["rows"]:
+            continue
+        idx = region["rows"].index(sigungu_name)
+        values = {column: region[column][idx] for column in ROW_COLUMNS}
+        values["votes"] = dict(zip(region["candidates"], region["votes"][idx]))
+        series.append((snapshot["timestamp"], values))
+    return series
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redis에 쌓인 개표 스냅샷 이력을 조회합니다.")
+    parser.add_argument("--latest", type=int, default=0, help="최근 N개 스냅샷의 버전과 시각을 출력합니다.")
+    parser.add_argument("--region", default="2600", help="'시도' 코드 (기본 2600).")
+    parser.add_argument("--candidate", help="이 후보자의 득표수 추이를 출력합니다.")
+    parser.add_argument("--sigungu", help="구시군을 지정합니다 (--candidate와 함께 쓰면 해당 구시군만).")
+    args = parser.parse_args()
+
+    client = get_redis_client(*get_redis_settings())
+    if args.latest:
+        for snapshot in latest_snapshots(client, args.latest):
+            print(snapshot["version"], snapshot["timestamp"], ", ".join(snapshot["regions"]))
+    if args.candidate:
+        for timestamp, votes in candidate_series(client, args.region, args.candidate, args.sigungu):
+            print(timestamp, votes)
+    elif args.sigungu:
+        for timestamp, values in sigungu_series(client, args.region, args.sigungu):
+            print(timestamp, values)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+from notifications import NOTIFY_CHANNEL
+from redis_store import PUSH_BACKOFF_BASE, PUSH_BACKOFF_CAP, TRANSIENT_ERRORS, get_async_redis_client, get_redis_settings
+
+# --- 실시간 알림 중계 서버 (Server-Sent Events) ---
+# Redis NOTIFY_CHANNEL을 한 번만 구독하고, 받은 메시지를 접속한 모든 클라이언트에게 SSE로 그대로 흘려보냅니다.
+# 시청자가 늘어도 Redis에는 구독 연결 하나만 생기므로 읽기 부하가 일정합니다.
+# 엔드포인트: GET /events (text/event-stream), GET /healthz (접속자 수, 마지막 버전, Redis 구독 상태. 구독 중이 아니면 503)
+# 새로 접속한 클라이언트에는 마지막으로 받은 메시지를 먼저 보내 바로 화면을 그릴 수 있게 합니다.
+# 별도 웹 프레임워크 없이 asyncio 스트림 서버만 사용합니다.
+
+DEFAULT_HOST = os.environ.get("LIVE_RELAY_HOST", "0.0.0.0")
+DEFAULT_PORT = int(os.environ.get("LIVE_RELAY_PORT", "8787"))
+ALLOWED_ORIGIN = os.environ.get("LIVE_RELAY_ALLOW_ORIGIN", "*")
+CLIENT_QUEUE_SIZE = 16 # 느린 클라이언트는 오래된 메시지부터 버림 (최신 버전만 중요)
+HEARTBEAT_SECONDS = 15 # 프록시가 유휴 연결을 끊지 않도록 주석 줄을 보냄
+RETRY_MILLISECONDS = 3000 # 연결이 끊겼을 때 브라우저 EventSource의 재접속 대기 시간
+
+
+class Broadcaster:
+    """클라이언트별 asyncio.Queue에 메시지를 나눠줍니다."""
+
+    def __init__(self):
+        self.clients = set()
+        self.last_message = None
+        self.last_version = None
+        self.consumer_status = "connecting" # connecting | subscribed | reconnecting | stopped
+        self.consumer_error = None
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        if self.last_message is not None:
+            queue.put_nowait(self.last_message)
+        self.clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.clients.discard(queue)
+
+    def publish(self, message):
+        self.last_message = message
+        try:
+            self.last_version = json.loads(message).get("version")
+        except (ValueError, AttributeError):
+            pass
+        for queue in self.clients:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+
+async def consume_redis(broadcaster, redis_settings, channel=NOTIFY_CHANNEL):
+    """
+    채널을 구독해 받은 메시지를 broadcaster로 넘깁니다. 연결이 끊기거나 다른 오류가 나도(인증, 응답, 디코딩 오류 등)
+    로그를 남기고 백오프 후 다시 구독합니다. 태스크 취소만 그대로 전달됩니다.
+    """
+    endpoint, port, password = redis_settings
+    attempt = 0
+    while True:
+        client = get_async_redis_client(endpoint, port, password)
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(channel)
+                print(f"[relay] Subscribed to Redis channel '{channel}' at {endpoint}:{port}")
+                broadcaster.consumer_status = "subscribed"
+                broadcaster.consumer_error = None
+                attempt = 0
+                while True:
+                    item = await pubsub.get_message(ignore_subscribe_messages=True, timeout=HEARTBEAT_SECONDS)
+                    if item is None:
+                        continue
+                    data = item["data"]
+                    broadcaster.publish(data.decode("utf-8") if isinstance(data, bytes) else data)
+        except Exception as e:
+            delay = min(PUSH_BACKOFF_CAP, PUSH_BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.5, 1.0)
+            attempt += 1
+            broadcaster.consumer_status = "reconnecting"
+            broadcaster.consumer_error = f"{type(e).__name__}: {e}"
+            if isinstance(e, TRANSIENT_ERRORS + (OSError,)):
+                print(f"[relay] Redis subscription lost ({e}). Reconnecting in {delay:.2f}s...")
+            else:
+                print(f"[relay] Unexpected error in Redis subscription ({type(e).__name__}: {e}). Reconnecting in {delay:.2f}s...")
+            await asyncio.sleep(delay)
+        finally:
+            await client.close()
+
+
+def _sse_frame(message):
+    lines = "".join(f"data: {line}\n" for line in message.splitlines() or [""])
+    return (lines + "\n").encode("utf-8")
+
+
+def _http_head(status, content_type, extra=""):
+    return (
+        f"HTTP/1.1 {status}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Access-Control-Allow-Origin: {ALLOWED_ORIGIN}\r\n"
+        "Cache-Control: no-cache\r\n"
+        f"{extra}\r\n"
+    ).encode("utf-8")
+
+
+async def _stream_events(broadcaster, writer):
+    writer.write(_http_head("200 OK", "text/event-stream; charset=utf-8", "Connection: keep-alive\r\nX-Accel-Buffering: no\r\n"))
+    writer.write(f"retry: {RETRY_MILLISECONDS}\n\n".encode("utf-8"))
+    await writer.drain()
+    queue = broadcaster.subscribe()
+    print(f"[relay] Client connected ({len(broadcaster.clients)} total)")
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                writer.write(_sse_frame(message))
+            except asyncio.TimeoutError:
+                writer.write(b": ping\n\n")
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        broadcaster.unsubscribe(queue)
+        print(f"[relay] Client disconnected ({len(broadcaster.clients)} total)")
+
+
+async def handle_client(broadcaster, reader, writer):
+    """요청 줄과 헤더만 읽어 경로별로 응답합니다."""
+    try:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        method, path = (request_line + ["", ""])[:2]
+        path = path.split("?", 1)[0]
+        if method == "GET" and path == "/events":
+            await _stream_events(broadcaster, writer)
+        elif method == "GET" and path == "/healthz":
+            body = json.dumps({
+                "clients": len(broadcaster.clients),
+                "last_version": broadcaster.last_version,
+                "consumer": broadcaster.consumer_status,
+                "consumer_error": broadcaster.consumer_error,
+            }).encode("utf-8")
+            status = "200 OK" if broadcaster.consumer_status == "subscribed" else "503 Service Unavailable"
+            writer.write(_http_head(status, "application/json", f"Content-Length: {len(body)}\r\nConnection: close\r\n") + body)
+        else:
+            writer.write(_http_head("404 Not Found", "text/plain", "Content-Length: 0\r\nConnection: close\r\n"))
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def _on_consumer_done(broadcaster, task):
+    """구독 태스크가 끝나면(취소 포함) /healthz가 실패로 보이도록 상태를 남깁니다."""
+    broadcaster.consumer_status = "stopped"
+    if not task.cancelled() and task.exception() is not None:
+        broadcaster.consumer_error = f"{type(task.exception()).__name__}: {task.exception()}"
+        print(f"[relay] Redis consumer stopped: {broadcaster.consumer_error}")
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, redis_settings=None):
+    broadcaster = Broadcaster()
+    consumer = asyncio.create_task(consume_redis(broadcaster, redis_settings or get_redis_settings()))
+    consumer.add_done_callback(lambda task: _on_consumer_done(broadcaster, task))
+    server = await asyncio.start_server(lambda r, w: handle_client(broadcaster, r, w), host, port)
+    print(f"[relay] Serving SSE on http://{host}:{port}/events")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        consumer.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redis 저장 알림을 구독해 브라우저에 Server-Sent Events로 중계합니다.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="바인드할 주소 (LIVE_RELAY_HOST).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="바인드할 포트 (LIVE_RELAY_PORT, 기본 8787).")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("[relay] Interrupted, shutting down.")
+
+
+if __name__ == "__main__":
+    main()
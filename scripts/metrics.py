@@ -0,0 +1,160 @@
+import contextlib
+import datetime
+import json
+import os
+import threading
+import time
+
+# --- 단계별 시간 측정과 메트릭 내보내기 ---
+# span()으로 감싼 구간의 소요 시간, 실패 여부를 기록하고 incr()/set_gauge()로 재시도 횟수, 페이로드 크기, 행 수를 남깁니다.
+# flush()를 부르면 이번 주기에 쌓인 기록을 JSON Lines 로그에 덧붙이고,
+# 누적 값을 Prometheus 텍스트 형식 파일로 다시 씁니다 (node_exporter textfile collector 등에서 읽을 수 있음).
+# 외부 서비스 없이 동작하며, 경로는 SCRAPER_METRICS_DIR(기본 "metrics")로 바꿀 수 있습니다.
+
+METRICS_DIR = os.environ.get("SCRAPER_METRICS_DIR", "metrics")
+JSON_LOG_FILENAME = "scraper_metrics.jsonl"
+PROMETHEUS_FILENAME = "scraper.prom"
+METRIC_PREFIX = "precount_scraper"
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_key, **extra):
+    pairs = list(label_key) + sorted((key, str(value)) for key, value in extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class MetricsRegistry:
+    """프로세스 안에서 공유되는 메트릭 저장소. HTTP 수집 스레드에서도 쓰이므로 잠금으로 보호합니다."""
+
+    def __init__(self, metrics_dir=METRICS_DIR):
+        self.metrics_dir = metrics_dir
+        self._lock = threading.Lock()
+        self.durations = {} # (step, labels) -> {"count", "sum", "last"}
+        self.errors = {} # (step, labels) -> 실패 횟수
+        self.counters = {} # (name, labels) -> 누적 값
+        self.gauges = {} # (name, labels) -> 마지막 값
+        self.pending_events = []
+        self.cycle_started = time.perf_counter()
+
+    def _event(self, record):
+        record["ts"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        self.pending_events.append(record)
+
+    @contextlib.contextmanager
+    def span(self, step, **labels):
+        """with span("parse", region="2600"): ... 구간의 소요 시간을 기록합니다. 예외는 그대로 전달됩니다."""
+        started = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            key = (step, _label_key(labels))
+            with self._lock:
+                stats = self.durations.setdefault(key, {"count": 0, "sum": 0.0, "last": 0.0})
+                stats["count"] += 1
+                stats["sum"] += duration
+                stats["last"] = duration
+                if not ok:
+                    self.errors[key] = self.errors.get(key, 0) + 1
+                self._event({"type": "span", "step": step, "duration_s": round(duration, 6), "ok": ok, **labels})
+
+    def incr(self, name, amount=1, **labels):
+        """재시도 횟수 같은 누적 카운터를 올립니다."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+            self._event({"type": "counter", "name": name, "amount": amount, **labels})
+
+    def set_gauge(self, name, value, **labels):
+        """페이로드 크기, 행 수처럼 마지막 값만 의미 있는 지표를 기록합니다."""
+        with self._lock:
+            self.gauges[(name, _label_key(labels))] = value
+            self._event({"type": "gauge", "name": name, "value": value, **labels})
+
+    def render_prometheus(self):
+        """누적 값을 Prometheus 텍스트 노출 형식으로 만듭니다."""
+        lines = []
+        with self._lock:
+            step_metric = f"{METRIC_PREFIX}_step_duration_seconds"
+            lines += [f"# HELP {step_metric} Time spent in each scraper step.", f"# TYPE {step_metric} summary"]
+            for (step, label_key), stats in sorted(self.durations.items()):
+                labels = _format_labels(label_key, step=step)
+                lines.append(f"{step_metric}_sum{labels} {stats['sum']:.6f}")
+                lines.append(f"{step_metric}_count{labels} {stats['count']}")
+            last_metric = f"{METRIC_PREFIX}_step_last_duration_seconds"
+            lines += [f"# HELP {last_metric} Duration of the most recent run of each step.", f"# TYPE {last_metric} gauge"]
+            for (step, label_key), stats in sorted(self.durations.items()):
+                lines.append(f"{last_metric}{_format_labels(label_key, step=step)} {stats['last']:.6f}")
+            error_metric = f"{METRIC_PREFIX}_step_errors_total"
+            lines += [f"# HELP {error_metric} Steps that raised an exception.", f"# TYPE {error_metric} counter"]
+            for (step, label_key), count in sorted(self.errors.items()):
+                lines.append(f"{error_metric}{_format_labels(label_key, step=step)} {count}")
+            for values, suffix, metric_type in ((self.counters, "_total", "counter"), (self.gauges, "", "gauge")):
+                previous_name = None
+                for (name, label_key), value in sorted(values.items()):
+                    metric = f"{METRIC_PREFIX}_{name}{suffix}"
+                    if name != previous_name:
+                        lines.append(f"# TYPE {metric} {metric_type}")
+                        previous_name = name
+                    lines.append(f"{metric}{_format_labels(label_key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def flush(self, **cycle_labels):
+        """
+        이번 주기의 기록을 JSON Lines 로그에 덧붙이고 Prometheus 파일을 갱신합니다.
+        주기 요약(전체 소요 시간, 단계별 합계)도 한 줄로 남깁니다. 파일 쓰기 실패는 수집을 막지 않습니다.
+        """
+        with self._lock:
+            events, self.pending_events = self.pending_events, []
+            cycle_duration = time.perf_counter() - self.cycle_started
+            self.cycle_started = time.perf_counter()
+        step_totals = {}
+        for event in events:
+            if event["type"] == "span":
+                step_totals[event["step"]] = round(step_totals.get(event["step"], 0.0) + event["duration_s"], 6)
+        summary = {
+            "type": "cycle",
+            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "duration_s": round(cycle_duration, 6),
+            "steps": step_totals,
+            **cycle_labels,
+        }
+        print(f"[metrics] Cycle took {cycle_duration:.2f}s; per-step: {step_totals}")
+
+        try:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            with open(os.path.join(self.metrics_dir, JSON_LOG_FILENAME), "a", encoding="utf-8") as f:
+                for event in events + [summary]:
+                    f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            prom_path = os.path.join(self.metrics_dir, PROMETHEUS_FILENAME)
+            with open(prom_path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(self.render_prometheus())
+            os.replace(prom_path + ".tmp", prom_path)
+        except OSError as e:
+            print(f"[metrics] Could not write metrics files: {e}")
+        return summary
+
+
+registry = MetricsRegistry()
+span = registry.span
+incr = registry.incr
+set_gauge = registry.set_gauge
+flush = registry.flush
+
+
+def set_metrics_dir(path):
+    """메트릭 파일을 쓸 디렉터리를 바꿉니다 (SCRAPER_METRICS_DIR 대신 코드에서 지정할 때)."""
+    registry.metrics_dir = path
@@ -0,0 +1,95 @@
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import etree
+
+# --- NEC 결과 페이지의 검색 폼이 보내는 요청을 브라우저 없이 직접 재현 ---
+# showDocument.xhtml?electionId=...&secondMenuId=VCCP09 페이지에서 검색 버튼을 누르면
+# 아래 파라미터로 electionInfo_report.xhtml 을 GET 요청합니다.
+NEC_BASE_URL = os.environ.get("NEC_BASE_URL", "http://info.nec.go.kr")
+REPORT_PATH = "/electioninfo/electionInfo_report.xhtml"
+ELECTION_ID = "0020250402"
+ELECTION_CODE = "11" # '#electionId11' 탭
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) "
+    "Gecko/20100101 Firefox/123.0"
+)
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+RESULT_TABLE_ID = "table01"
+
+_session = None
+# 응답 문서 전체를 BeautifulSoup 트리로 만들지 않고 lxml로 바로 파싱 (XML 선언이 있어도 되도록 bytes로 넘김)
+_DOCUMENT_PARSER = etree.HTMLParser(encoding="utf-8")
+
+
+def get_session():
+    """keep-alive 연결을 재사용하는 requests.Session을 (최초 1회) 생성해 반환합니다."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20) # 17개 시도를 한 번에 요청해도 연결을 모두 재사용
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Referer": f"{NEC_BASE_URL}/main/showDocument.xhtml?electionId={ELECTION_ID}&topMenuId=VC&secondMenuId=VCCP09",
+        })
+        _session = session
+    return _session
+
+
+def build_report_params(city_code):
+    """검색 폼과 동일한 쿼리 파라미터를 만듭니다."""
+    return {
+        "electionId": ELECTION_ID,
+        "requestURI": f"/electioninfo/{ELECTION_ID}/vc/vccp09.jsp",
+        "topMenuId": "VC",
+        "secondMenuId": "VCCP09",
+        "menuId": "VCCP09",
+        "statementId": f"VCCP09_#{ELECTION_CODE}",
+        "electionCode": ELECTION_CODE,
+        "cityCode": city_code,
+        "sggCityCode": "-1",
+        "townCode": "-1",
+        "sggTownCode": "0",
+    }
+
+
+def extract_table_inner_html(document_html, table_id=RESULT_TABLE_ID):
+    """
+    응답 문서에서 결과 테이블의 내부 HTML만 꺼냅니다.
+    Playwright의 page.inner_html("table#<table_id>")와 같은 형태를 반환하며, 테이블이 없으면 None.
+    """
+    if not document_html or not document_html.strip():
+        return None
+    root = etree.fromstring(document_html.encode("utf-8"), _DOCUMENT_PARSER)
+    if root is None:
+        return None
+    table = next(iter(root.iterfind(f".//table[@id='{table_id}']")), None)
+    if table is None:
+        return None
+    return (table.text or "") + "".join(etree.tostring(child, method="html", encoding="unicode") for child in table)
+
+
+def fetch_table_html(city_code, base_url=None, session=None):
+    """
+    HTTP 요청 한 번으로 결과 테이블 HTML을 가져옵니다.
+    네트워크 오류나 테이블이 없는 응답이면 None을 반환해 호출 측이 Playwright로 넘어가게 합니다.
+    """
+    url = (base_url or NEC_BASE_URL).rstrip("/") + REPORT_PATH
+    session = session or get_session()
+    try:
+        response = session.get(url, params=build_report_params(city_code), timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"HTTP fetch failed for cityCode {city_code}: {e}")
+        return None
+
+    # NEC 페이지는 charset 헤더가 없는 경우가 있어 본문 기준으로 인코딩을 추정
+    if not response.encoding or response.encoding.lower() == "iso-8859-1":
+        response.encoding = response.apparent_encoding
+    html = extract_table_inner_html(response.text)
+    if html is None:
+        print(f"HTTP response for cityCode {city_code} did not contain a result table.")
+    return html
@@ -0,0 +1,199 @@
+from typing import NamedTuple, Optional, Tuple
+from lxml import etree
+
+# --- 결과 테이블(table#table01) 파서 ---
+# BeautifulSoup 트리 대신 lxml 요소를 직접 순회합니다.
+# tbody 구조: 첫 번째 tr = 후보자명, 두 번째 tr = 합계, 세 번째 tr = 합계 득표율,
+# 이후 (구시군 숫자 행, 득표율 행)이 반복됩니다. 득표율 행은 셀 텍스트를 만들지 않고 건너뜁니다.
+
+_HTML_PARSER = etree.HTMLParser(remove_comments=True)
+_TEXT_NODES = etree.XPath(".//text()")
+
+
+class ResultRow(NamedTuple):
+    """구시군(또는 합계) 숫자 행 하나. 값은 페이지에 표시된 문자열 그대로입니다."""
+    name: str
+    eligible_voters: str
+    votes_cast: str
+    candidate_votes: Tuple[str, ...]
+    candidate_total: Optional[str] = None
+    invalid_votes: Optional[str] = None
+    abstentions: Optional[str] = None
+    turnout_rate: Optional[str] = None
+
+    def to_entry(self, candidate_names):
+        """Redis에 저장하는 기존 dict 형태(한글 컬럼명 키)로 변환합니다."""
+        entry = {"구시군명": self.name, "선거인수": self.eligible_voters, "투표수": self.votes_cast}
+        for cand_name, votes in zip(candidate_names, self.candidate_votes):
+            entry[cand_name] = votes
+        for key, value in (("후보자계", self.candidate_total), ("무효투표수", self.invalid_votes),
+                           ("기권수", self.abstentions), ("개표율", self.turnout_rate)):
+            if value is not None:
+                entry[key] = value
+        return entry
+
+    def counts(self):
+        """숫자 컬럼을 정수(개표율은 float)로 바꾼 dict. 변환할 수 없는 값은 None."""
+        return {
+            "eligible": _to_int(self.eligible_voters),
+            "cast": _to_int(self.votes_cast),
+            "votes": [_to_int(votes) for votes in self.candidate_votes],
+            "candidate_total": _to_int(self.candidate_total),
+            "invalid": _to_int(self.invalid_votes),
+            "abstentions": _to_int(self.abstentions),
+            "turnout": _to_float(self.turnout_rate),
+        }
+
+
+def _to_int(text):
+    if text is None:
+        return None
+    digits = text.replace(',', '')
+    return int(digits) if digits.isdigit() else None
+
+
+def _to_float(text):
+    if not text:
+        return None
+    try:
+        return float(text.replace('%', ''))
+    except ValueError:
+        return None
+
+
+def build_table(candidate_names, summary_row, sigungu_rows):
+    """
+    파싱 시점에 숫자를 한 번만 정수로 바꾼 열 단위(columnar) 테이블.
+    {"candidates", "rows": [구시군명], "eligible"/"cast"/"candidate_total"/"invalid"/"abstentions"/"turnout": [행별 값],
+     "votes": [[후보자별 득표] 행별], "summary": {같은 키의 합계 값} 또는 None}
+    """
+    typed_rows = [row.counts() for row in sigungu_rows]
+    table = {"candidates": list(candidate_names), "rows": [row.name for row in sigungu_rows]}
+    for column in ("eligible", "cast", "candidate_total", "invalid", "abstentions", "turnout", "votes"):
+        table[column] = [typed[column] for typed in typed_rows]
+    table["summary"] = summary_row.counts() if summary_row else None
+    return table
+
+
+def row_from_entry(entry, candidate_names):
+    """ResultRow.to_entry()의 역변환: 기존 키에 저장된 dict에서 ResultRow를 되살립니다."""
+    return ResultRow(
+        entry.get("구시군명"), entry.get("선거인수"), entry.get("투표수"), tuple(entry.get(name) for name in candidate_names),
+        entry.get("후보자계"), entry.get("무효투표수"), entry.get("기권수"), entry.get("개표율"),
+    )
+
+
+def table_from_entries(candidate_names, summary_entry, entries):
+    """기존 키 형태(표시 문자열 dict)로 저장된 지역 데이터에서 build_table()과 같은 열 단위 테이블을 다시 만듭니다."""
+    summary_row = row_from_entry(summary_entry, candidate_names) if summary_entry else None
+    return build_table(candidate_names, summary_row, [row_from_entry(entry, candidate_names) for entry in entries])
+
+
+def _cell_text(element):
+    """BeautifulSoup의 get_text(strip=True)와 같은 결과: 텍스트 조각마다 strip 후 이어 붙임."""
+    return "".join(text.strip() for text in _TEXT_NODES(element))
+
+
+def _row_values(tr):
+    return [_cell_text(td) for td in tr.iter("td")]
+
+
+def _has_class(element, class_name):
+    return class_name in (element.get("class") or "").split()
+
+
+def _row_from_values(values, n_candidates):
+    """셀 텍스트 목록을 ResultRow로 만듭니다. 후보자 이후 컬럼은 없으면 None."""
+    tail_idx = 3 + n_candidates
+    extra = values[tail_idx:tail_idx + 4]
+    extra += [None] * (4 - len(extra))
+    return ResultRow(values[0], values[1], values[2], tuple(values[3:tail_idx]), *extra)
+
+
+def extract_candidate_names(first_tr):
+    """첫 번째 tr의 td.alignC > strong 텍스트를 "계" 이전까지 후보자명으로 사용합니다."""
+    candidate_names = []
+    for td in first_tr.iter("td"):
+        if not _has_class(td, "alignC"):
+            continue
+        strong = next(td.iter("strong"), None)
+        if strong is None:
+            continue
+        name = _cell_text(strong)
+        if name == "계": # "계" 컬럼은 후보자가 아님
+            break
+        if name:
+            candidate_names.append(name)
+    return candidate_names
+
+
+def iter_sigungu_rows(data_rows, n_candidates):
+    """
+    네 번째 tr부터 두 행 간격으로 구시군 숫자 행을 ResultRow로 내보냅니다.
+    구시군명이 없거나 선거인수가 숫자가 아니거나 컬럼이 모자란 행은 건너뜁니다.
+    """
+    expected_min_cols = 3 + n_candidates + 3 # 최소 (구시군,선거인,투표수 + 후보자N + 계,무효,기권)
+    for tr_idx in range(3, len(data_rows), 2): # 3, 5, 7, ...
+        values = _row_values(data_rows[tr_idx])
+        if len(values) < 2 or not values[0] or not values[1].replace(',', '').isdigit():
+            print(f"Skipping non-data row or row with invalid 선거인수: {values}")
+            continue
+        if len(values) < expected_min_cols:
+            print(f"Skipping sigungu row due to insufficient columns (expected at least {expected_min_cols}): {values}")
+            continue
+        yield _row_from_values(values, n_candidates)
+
+
+def parse_result_html(html, execution_timestamp):
+    """
+    결과 테이블 HTML(page.inner_html("table#table01"))을 파싱해 Redis에 저장할 데이터 구조를 만듭니다 (Step 7).
+    "data"/"summary"는 기존 키에 저장하던 표시 문자열 형태이고, "table"은 정수로 변환된 열 단위 형태입니다.
+    """
+    print("Step 7: Parsing HTML with lxml...")
+    root = etree.fromstring(html, _HTML_PARSER) if html and html.strip() else None
+    tbody = next(root.iter("tbody"), None) if root is not None else None
+    if tbody is None: raise ValueError("Parsing Error: Could not find <tbody> in the table HTML.")
+
+    data_rows = list(tbody.iter("tr"))
+    if not data_rows:
+        raise ValueError("Parsing Error: Could not find the first row in <tbody> for candidate names.")
+
+    candidate_names = extract_candidate_names(data_rows[0])
+    if not candidate_names:
+        raise ValueError("Critical Parsing Error: Candidate names could not be extracted from the first row of <tbody>.")
+    print(f"Dynamically extracted candidate names: {candidate_names}")
+
+    if len(data_rows) < 2: # 최소 후보자명 행 + 합계 행
+        raise ValueError("Parsing Error: Not enough rows in tbody to get summary and data.")
+
+    summary_row_data = {}
+    summary_row = None
+    summary_row_values = _row_values(data_rows[1])
+    if summary_row_values and summary_row_values[0] == "합계":
+        print(f"Found summary row: {summary_row_values}")
+        if len(summary_row_values) < 3 + len(candidate_names):
+            raise ValueError(f"Parsing Error: Summary row has fewer columns than candidates: {summary_row_values}")
+        summary_row = _row_from_values(summary_row_values, len(candidate_names))
+        summary_row_data = summary_row.to_entry(candidate_names)
+    else:
+        print("Warning: Could not parse the summary row (expected as the second row in tbody).")
+
+    sigungu_rows = list(iter_sigungu_rows(data_rows, len(candidate_names)))
+    sigungu_data_list = [row.to_entry(candidate_names) for row in sigungu_rows]
+    if not sigungu_data_list:
+        raise ValueError("Parsing Error: No valid sigungu data rows processed after filtering.")
+
+    scraped_data_for_redis = {
+        "timestamp": execution_timestamp,
+        "candidates": candidate_names,
+        "data": sigungu_data_list,
+        "summary": summary_row_data,
+        "table": build_table(candidate_names, summary_row, sigungu_rows),
+    }
+    print(f"Data prepared for Redis (timestamp: {execution_timestamp})")
+    print(f"Candidate names for Redis: {candidate_names}")
+    print(f"Number of sigungu data rows for Redis: {len(sigungu_data_list)}")
+    print(f"Sample sigungu data entry for Redis: {sigungu_data_list[0]}")
+    if summary_row_data: print(f"Summary row data for Redis: {summary_row_data}")
+    print("Step 7: HTML parsing completed.")
+    return scraped_data_for_redis
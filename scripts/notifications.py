@@ -0,0 +1,47 @@
+import json
+
+# --- 저장 완료 알림 (Redis Pub/Sub) ---
+# publish_results()가 키를 저장하는 같은 트랜잭션에서 NOTIFY_CHANNEL로 짧은 메시지를 PUBLISH 합니다.
+# 구독자(live_relay.py 등)는 메시지만 보고 바뀐 부분을 알 수 있고, 전체 데이터가 필요할 때만 키를 읽으면 됩니다.
+# 메시지: {"version", "base_version", "timestamp",
+#          "regions": {지역코드: {"changed": [구시군명], "removed": [구시군명], "summary": {합계 행}, "projected": {후보자: 추정 득표}}}}
+# 지역이 많아 NOTIFY_MAX_BYTES를 넘으면 구시군명 목록을 빼고 "truncated": true를 붙입니다.
+
+NOTIFY_CHANNEL = "live_election_data_updates"
+NOTIFY_MAX_BYTES = 16 * 1024
+
+
+def _dumps(message):
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+
+
+def build_notification(delta, projected_by_region):
+    """delta(detect_changes 결과)와 지역별 계산 결과로 PUBLISH할 JSON 문자열을 만듭니다."""
+    regions = {}
+    for city_code, region_delta in delta.get("regions", {}).items():
+        projected = (projected_by_region.get(city_code) or {}).get("projected_votes_by_candidate")
+        region_message = {
+            "changed": list(region_delta.get("changed", {})),
+            "summary": region_delta.get("summary"),
+            "projected": projected,
+        }
+        if region_delta.get("removed"):
+            region_message["removed"] = region_delta["removed"]
+        if region_delta.get("full"):
+            region_message["full"] = True
+        regions[city_code] = region_message
+
+    message = {
+        "version": delta.get("version"),
+        "base_version": delta.get("base_version"),
+        "timestamp": delta.get("timestamp"),
+        "regions": regions,
+    }
+    payload = _dumps(message)
+    if len(payload.encode("utf-8")) > NOTIFY_MAX_BYTES:
+        for region_message in regions.values():
+            region_message.pop("changed", None)
+            region_message.pop("removed", None)
+        message["truncated"] = True
+        payload = _dumps(message)
+    return payload
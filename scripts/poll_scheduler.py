@@ -0,0 +1,130 @@
+import random
+
+# --- 개표 진행 속도에 맞춘 적응형 수집 간격 ---
+# 직전 수집 대비 합계 행 개표율의 증가 속도(%p/초)와 바뀐 구시군 행 수를 보고 다음 수집까지 기다릴 시간을 정합니다.
+# - 개표율이 빠르게 오르면: TARGET_TURNOUT_STEP(%p)만큼 오를 시간 뒤에 다시 수집 (최소 간격까지 줄어듦)
+# - 개표율은 그대로지만 행이 바뀌었으면: 지금 간격 유지
+# - 아무것도 바뀌지 않았으면: IDLE_GROWTH배씩 늘려 최대 간격까지
+# - 수집/저장이 실패하면: 최소 간격에서 시작해 실패할 때마다 두 배 (최대 간격까지)
+# - 일부 지역만 계속 실패하면: 그 지역만 같은 방식의 백오프 동안 수집 대상에서 빠지고 나머지 지역은 평소대로 수집
+# 모든 지역 개표율이 100%가 되면 all_counted()가 True가 되어 watch 루프가 멈춥니다.
+
+DEFAULT_MIN_INTERVAL_SECONDS = 15.0
+DEFAULT_MAX_INTERVAL_SECONDS = 300.0
+DEFAULT_JITTER = 0.1 # 간격의 ±10%. 여러 수집기가 같은 순간에 몰리지 않도록
+TARGET_TURNOUT_STEP = 0.5 # 수집 한 번 사이에 개표율이 이 정도(%p) 오르는 속도를 목표로 함
+IDLE_GROWTH = 1.5
+COMPLETE_TURNOUT = 100.0
+
+
+def _turnout_value(region_data):
+    table_summary = (region_data.get("table") or {}).get("summary") or {}
+    if table_summary.get("turnout") is not None:
+        return table_summary["turnout"]
+    text = str((region_data.get("summary") or {}).get("개표율", "")).replace('%', '').strip()
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def region_turnouts(regions):
+    """{지역코드: 합계 행 개표율(float)}. 개표율을 읽을 수 없는 지역은 빠집니다."""
+    turnouts = {}
+    for city_code, region_data in regions.items():
+        value = _turnout_value(region_data)
+        if value is not None:
+            turnouts[city_code] = value
+    return turnouts
+
+
+class AdaptivePollScheduler:
+    """
+    watch 루프가 tick마다 record_success()/record_failure()로 결과를 알려주면 next_delay()로 다음 대기 시간을 돌려줍니다.
+    시각은 호출하는 쪽이 time.monotonic() 등으로 넘깁니다.
+    """
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL_SECONDS, max_interval=DEFAULT_MAX_INTERVAL_SECONDS,
+                 jitter=DEFAULT_JITTER, target_step=TARGET_TURNOUT_STEP, rng=None):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError(f"Invalid polling interval range: min {min_interval}s, max {max_interval}s")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.target_step = target_step
+        self.rng = rng or random.Random()
+        self.interval = min_interval # 처음에는 빠르게 수집해 진행 속도를 파악
+        self.consecutive_errors = 0
+        self.region_errors = {} # {지역코드: 연속 실패 횟수}
+        self.region_retry_at = {} # {지역코드: 다시 수집할 시각}
+        self.last_turnouts = {}
+        self.last_success_at = None
+
+    def _clamp(self, seconds):
+        return max(self.min_interval, min(self.max_interval, seconds))
+
+    def record_success(self, turnouts, changed_rows, now):
+        """성공한 tick의 개표율과 바뀐 행 수로 다음 기본 간격을 정해 반환합니다 (지터 적용 전)."""
+        self.consecutive_errors = 0
+        increases = [value - self.last_turnouts[code] for code, value in turnouts.items() if code in self.last_turnouts]
+        turnout_delta = max(increases, default=0.0)
+        elapsed = now - self.last_success_at if self.last_success_at is not None else None
+
+        if elapsed and turnout_delta > 0:
+            rate = turnout_delta / elapsed # %p/초
+            self.interval = self._clamp(self.target_step / rate)
+        elif changed_rows:
+            self.interval = self._clamp(self.interval)
+        else:
+            self.interval = self._clamp(self.interval * IDLE_GROWTH)
+
+        self.last_turnouts.update(turnouts)
+        self.last_success_at = now
+        print(f"[scheduler] 개표율 +{turnout_delta:.2f}%p, {changed_rows} changed row(s) -> next interval {self.interval:.1f}s")
+        return self.interval
+
+    def _backoff(self, errors=None):
+        errors = self.consecutive_errors if errors is None else errors
+        return self._clamp(self.min_interval * (2 ** (errors - 1)))
+
+    def record_failure(self):
+        """실패한 tick마다 간격을 최소 간격부터 두 배씩 늘립니다. 다음 성공 때 원래 규칙으로 돌아갑니다."""
+        self.consecutive_errors += 1
+        backoff = self._backoff()
+        print(f"[scheduler] {self.consecutive_errors} consecutive failure(s) -> backing off {backoff:.1f}s")
+        return backoff
+
+    def record_regions(self, succeeded, failed, now):
+        """
+        tick에서 시도한 지역별 결과를 기록합니다. 연속으로 실패한 지역은 다른 지역과 별개로
+        최소 간격부터 실패할 때마다 두 배씩 늘어나는 시간 동안 due_regions()에서 빠집니다 (최대 간격까지).
+        """
+        for city_code in succeeded:
+            self.region_errors.pop(city_code, None)
+            self.region_retry_at.pop(city_code, None)
+        for city_code in failed:
+            errors = self.region_errors.get(city_code, 0) + 1
+            self.region_errors[city_code] = errors
+            # 지터 때문에 다음 tick이 조금 일찍 와도 첫 실패 직후의 tick은 건너뛰지 않도록 (1 - jitter)를 곱함
+            backoff = self._backoff(errors) * (1 - self.jitter)
+            self.region_retry_at[city_code] = now + backoff
+            print(f"[scheduler] cityCode {city_code}: {errors} consecutive failure(s) -> skipping it for {backoff:.1f}s")
+
+    def due_regions(self, city_codes, now):
+        """백오프 중이 아닌(지금 수집할) 지역 코드 목록. 순서는 city_codes를 따릅니다."""
+        return [code for code in city_codes if self.region_retry_at.get(code, now) <= now]
+
+    def backoff_remaining(self, city_codes, now):
+        """모든 지역이 백오프 중이면 가장 먼저 다시 수집할 지역까지 남은 시간(초), 수집할 지역이 있으면 None."""
+        if not city_codes or self.due_regions(city_codes, now):
+            return None
+        return max(0.0, min(self.region_retry_at[code] for code in city_codes) - now)
+
+    def next_delay(self):
+        """다음 tick까지 기다릴 시간(초). 실패 중이면 백오프 간격, 아니면 기본 간격에 지터를 더합니다."""
+        base = self._backoff() if self.consecutive_errors else self.interval
+        return self._clamp(base * self.rng.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def all_counted(self, city_codes):
+        """수집 대상 지역이 모두 개표율 100%를 보고했는지."""
+        return bool(city_codes) and all(self.last_turnouts.get(code, 0.0) >= COMPLETE_TURNOUT for code in city_codes)
@@ -0,0 +1,262 @@
+from statistics import NormalDist
+from typing import List, NamedTuple
+import numpy as np
+
+# --- NumPy 기반 최종 결과 추정 엔진 ---
+# 구시군 × 후보자 득표 행렬과 선거인수/투표수/무효투표수 벡터를 한 번만 만들고,
+# 추정치는 구시군별 항 (득표수 / 투표수) × 선거인수 를 한꺼번에 계산해 더합니다.
+# 합산은 np.cumsum으로 구시군 순서대로 누적해 기존 Python 루프와 같은 부동소수 결과를 냅니다.
+
+DEFAULT_CONFIDENCE_LEVEL = 0.95
+
+
+class ProjectionInputs(NamedTuple):
+    """
+    추정에 필요한 배열.
+    valid: 선거인수/투표수/무효투표수 변환에 성공한 행 (선거인수 합계에 포함)
+    complete: 후보자 득표수까지 모두 변환된 행
+    """
+    row_names: List[str]
+    candidate_names: List[str]
+    counts: np.ndarray # (구시군, 후보자) 득표수
+    eligible: np.ndarray # 선거인수
+    votes_cast: np.ndarray # 투표수
+    invalid: np.ndarray # 무효투표수
+    valid: np.ndarray
+    complete: np.ndarray
+
+    @property
+    def projectable(self):
+        """추정에 쓰이는 행: 모든 값이 변환되었고 투표수가 0이 아닌 행."""
+        return self.valid & self.complete & (self.votes_cast > 0)
+
+
+def to_int(value):
+    """'1,234' 같은 표시 문자열(또는 이미 정수인 값)을 정수로 바꿉니다."""
+    return int(str(value).replace(',', ''))
+
+
+def _inputs_from_table(table):
+    """파서가 이미 정수로 바꿔 둔 열 단위 테이블("table")로 배열을 만듭니다. None은 변환 실패 값입니다."""
+    n_rows, n_cands = len(table["rows"]), len(table["candidates"])
+    base = [table["eligible"], table["cast"], table["invalid"]]
+    valid = np.array([all(column[i] is not None for column in base) for i in range(n_rows)], dtype=bool)
+    complete = np.array([None not in votes for votes in table["votes"]], dtype=bool)
+    eligible, votes_cast, invalid = (np.array([value or 0 for value in column], dtype=np.int64) for column in base)
+    counts = np.array([[value or 0 for value in votes] for votes in table["votes"]], dtype=np.int64).reshape(n_rows, n_cands)
+    for i in np.flatnonzero(~(valid & complete)):
+        print(f"Unparsable numeric value for sigungu {table['rows'][i]} during projection. Excluding it from projection.")
+    return ProjectionInputs(list(table["rows"]), list(table["candidates"]), counts, eligible, votes_cast, invalid, valid, complete)
+
+
+def build_projection_inputs(scraped_data):
+    """
+    수집된 데이터로 추정용 배열을 만듭니다.
+    파서가 만든 정수형 "table"이 있으면 그대로 쓰고, 없으면 문자열 값을 행마다 한 번씩만 정수로 바꿉니다.
+    """
+    candidate_names = list(scraped_data.get("candidates") or [])
+    rows = scraped_data.get("data") or []
+    table = scraped_data.get("table")
+    if table and table.get("candidates") == candidate_names and len(table.get("rows", [])) == len(rows):
+        return _inputs_from_table(table)
+    n_rows, n_cands = len(rows), len(candidate_names)
+    counts = np.zeros((n_rows, n_cands), dtype=np.int64)
+    eligible = np.zeros(n_rows, dtype=np.int64)
+    votes_cast = np.zeros(n_rows, dtype=np.int64)
+    invalid = np.zeros(n_rows, dtype=np.int64)
+    valid = np.zeros(n_rows, dtype=bool)
+    complete = np.zeros(n_rows, dtype=bool)
+    row_names = []
+
+    for i, row in enumerate(rows):
+        sigungu_name = row.get('구시군명', 'N/A')
+        row_names.append(sigungu_name)
+        try:
+            eligible[i] = to_int(row.get("선거인수", "0"))
+            votes_cast[i] = to_int(row.get("투표수", "0"))
+            invalid[i] = to_int(row.get("무효투표수", "0"))
+        except ValueError as ve:
+            print(f"ValueError converting data for sigungu {sigungu_name} during projection: {ve}. Row data: {row}")
+            continue
+        valid[i] = True
+        try:
+            counts[i] = [to_int(row.get(cand_name, "0")) for cand_name in candidate_names]
+            complete[i] = True
+        except ValueError as ve:
+            # 선거인수는 합계에 포함하되 이 구시군은 추정에서 제외
+            print(f"ValueError converting data for sigungu {sigungu_name} during projection: {ve}. Row data: {row}")
+
+    return ProjectionInputs(row_names, candidate_names, counts, eligible, votes_cast, invalid, valid, complete)
+
+
+def _row_weights(inputs):
+    """구시군별 선거인수 / 투표수. 추정에서 제외되는 행은 0."""
+    mask = inputs.projectable
+    weights = np.zeros(len(mask), dtype=np.float64)
+    np.divide(inputs.eligible, inputs.votes_cast, out=weights, where=mask)
+    return weights, mask
+
+
+def _sequential_sum(terms):
+    """구시군 순서대로 누적한 합계 (0행이면 0)."""
+    if terms.shape[0] == 0:
+        return np.zeros(terms.shape[1:], dtype=np.float64)
+    return np.cumsum(terms, axis=0)[-1]
+
+
+def projection_terms(inputs):
+    """
+    구시군별 추정 항을 계산합니다. 추정에서 제외되는 행의 항은 0입니다.
+    반환값: ((구시군, 후보자) 후보자 항 행렬, 구시군별 무효표 항)
+    """
+    mask = inputs.projectable
+    cast = np.where(mask, inputs.votes_cast, 1).astype(np.float64)
+    candidate_terms = np.where(mask[:, None], (inputs.counts / cast[:, None]) * inputs.eligible[:, None], 0.0)
+    invalid_terms = np.where(mask, (inputs.invalid / cast) * inputs.eligible, 0.0)
+    return candidate_terms, invalid_terms
+
+
+def project_votes(inputs):
+    """
+    후보자별 추정 득표수와 추정 무효표수(반올림 전 float)를 계산합니다.
+    반환값: (후보자별 추정치 배열, 무효표 추정치)
+    """
+    candidate_terms, invalid_terms = projection_terms(inputs)
+    return _sequential_sum(candidate_terms), float(_sequential_sum(invalid_terms))
+
+
+def _sampling_model(inputs):
+    """
+    개표된 표(후보자 득표 + 무효)를 투표수에서 비복원 추출한 표본으로 보고, 범주별 비율과 유한모집단 보정값을 만듭니다.
+    반환값: (추정 대상 행 인덱스, 개표된 표 수, 범주 비율(후보자..., 무효), 유한모집단 보정, 선거인수/투표수)
+    """
+    weights, mask = _row_weights(inputs)
+    categories = np.concatenate([inputs.counts, inputs.invalid[:, None]], axis=1)
+    counted = categories.sum(axis=1)
+    rows = np.flatnonzero(mask & (counted > 0))
+    counted = counted[rows]
+    proportions = categories[rows] / counted[:, None]
+    population = inputs.votes_cast[rows].astype(np.float64)
+    fpc = np.clip((population - counted) / np.maximum(population - 1, 1), 0.0, 1.0)
+    return rows, counted, proportions, fpc, weights[rows]
+
+
+def variance_terms(inputs):
+    """
+    구시군 i의 후보자 j 항의 분산: (선거인수/투표수)² × n p (1-p) × 유한모집단 보정.
+    반환값: (구시군, 후보자) 분산 행렬. 추정에서 제외되는 행은 0.
+    """
+    rows, counted, proportions, fpc, weights = _sampling_model(inputs)
+    variance = np.zeros(inputs.counts.shape, dtype=np.float64)
+    p = proportions[:, :-1]
+    variance[rows] = ((weights ** 2) * counted * fpc)[:, None] * p * (1 - p)
+    return variance
+
+
+def interval_from_variance(projected, variance, level=DEFAULT_CONFIDENCE_LEVEL):
+    """추정치와 분산 합계로 정규근사 신뢰구간을 만듭니다. 반환값: (하한, 상한)"""
+    half_width = NormalDist().inv_cdf(0.5 + level / 2) * np.sqrt(variance)
+    return projected - half_width, projected + half_width
+
+
+def analytic_intervals(inputs, level=DEFAULT_CONFIDENCE_LEVEL):
+    """
+    아직 개표되지 않은 표에서 오는 불확실성을 정규근사로 계산한 후보자별 신뢰구간.
+    반환값: (하한 배열, 상한 배열)
+    """
+    projected, _ = project_votes(inputs)
+    return interval_from_variance(projected, variance_terms(inputs).sum(axis=0), level)
+
+
+class RowContribution(NamedTuple):
+    """구시군 하나가 합계에 보태는 값."""
+    eligible: int # 선거인수 합계에 들어가는 값 (변환 실패 행은 0)
+    terms: dict # 후보자명 -> 추정 항
+    invalid: float # 무효표 추정 항
+    variance: dict # 후보자명 -> 분산 항
+
+
+class ProjectionAccumulator:
+    """
+    한 지역의 구시군별 추정 항을 보관하고, 새 스냅샷에서 바뀐 행만 이전 항을 빼고 새 항을 더해 합계를 갱신합니다.
+    후보자별 합계는 이름을 키로 관리하므로 후보자가 새로 생기거나 빠져도 됩니다.
+    덧셈/뺄셈이 반복되며 생기는 부동소수 오차는 REBASE_EVERY 행마다 전체를 다시 더해 없앱니다.
+    """
+    REBASE_EVERY = 1000
+
+    def __init__(self):
+        self.candidates = []
+        self.rows = {} # 구시군명 -> RowContribution (수집 순서 유지)
+        self.candidate_totals = {}
+        self.variance_totals = {}
+        self.invalid_total = 0.0
+        self.eligible_total = 0
+        self.updates_since_rebase = 0
+
+    def reset(self, scraped_data):
+        """지역 전체 데이터로 처음부터 다시 만듭니다."""
+        self.__init__()
+        return self.apply(scraped_data.get("candidates") or [], scraped_data.get("data") or [])
+
+    def apply(self, candidates, changed_rows, removed_names=()):
+        """
+        바뀐 행(구시군 dict 목록)과 사라진 구시군명을 반영합니다. 반환값: 다시 계산한 행 수.
+        """
+        self.candidates = list(candidates)
+        for name in removed_names:
+            self._discard(name)
+
+        changed_rows = list(changed_rows)
+        if changed_rows:
+            inputs = build_projection_inputs({"candidates": self.candidates, "data": changed_rows})
+            candidate_terms, invalid_terms = projection_terms(inputs)
+            variance = variance_terms(inputs)
+            for i, name in enumerate(inputs.row_names):
+                self._discard(name)
+                self._add(name, RowContribution(
+                    int(inputs.eligible[i]) if inputs.valid[i] else 0,
+                    dict(zip(self.candidates, candidate_terms[i].tolist())),
+                    float(invalid_terms[i]),
+                    dict(zip(self.candidates, variance[i].tolist())),
+                ))
+
+        self.updates_since_rebase += len(changed_rows) + len(removed_names)
+        if self.updates_since_rebase >= self.REBASE_EVERY:
+            self._rebase()
+        return len(changed_rows)
+
+    def _add(self, name, contribution):
+        self.rows[name] = contribution
+        self.eligible_total += contribution.eligible
+        self.invalid_total += contribution.invalid
+        for cand_name, term in contribution.terms.items():
+            self.candidate_totals[cand_name] = self.candidate_totals.get(cand_name, 0.0) + term
+        for cand_name, term in contribution.variance.items():
+            self.variance_totals[cand_name] = self.variance_totals.get(cand_name, 0.0) + term
+
+    def _discard(self, name):
+        contribution = self.rows.pop(name, None)
+        if contribution is None:
+            return
+        self.eligible_total -= contribution.eligible
+        self.invalid_total -= contribution.invalid
+        for cand_name, term in contribution.terms.items():
+            self.candidate_totals[cand_name] -= term
+        for cand_name, term in contribution.variance.items():
+            self.variance_totals[cand_name] -= term
+
+    def _rebase(self):
+        rows = self.rows
+        self.rows, self.candidate_totals, self.variance_totals = {}, {}, {}
+        self.invalid_total, self.eligible_total, self.updates_since_rebase = 0.0, 0, 0
+        for name, contribution in rows.items():
+            self._add(name, contribution)
+
+    def projection(self):
+        """
+        현재 후보자 목록 기준 합계.
+        반환값: (후보자별 추정치 배열, 무효표 추정치, 선거인수 합계, 후보자별 분산 배열)
+        """
+        projected = np.array([self.candidate_totals.get(name, 0.0) for name in self.candidates], dtype=np.float64)
+        variance = np.array([max(0.0, self.variance_totals.get(name, 0.0)) for name in self.candidates], dtype=np.float64)
+        return projected, self.invalid_total, self.eligible_total, variance
@@ -0,0 +1,57 @@
+import datetime
+import glob
+import os
+
+# --- 결과 테이블 HTML 녹화 ---
+# 녹화를 켜면 (scrape_push.py --record DIR 또는 NEC_RECORD_DIR) 수집한 table#table01 내부 HTML을
+# DIR/<지역코드>/<UTC 시각>.html 로 남깁니다. replay_harness.py가 같은 구조를 읽어 재생합니다.
+
+FILENAME_TIME_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+_record_dir = os.environ.get("NEC_RECORD_DIR") or None
+
+
+def set_record_dir(path):
+    """녹화 디렉터리를 지정합니다. None이면 녹화하지 않습니다."""
+    global _record_dir
+    _record_dir = path or None
+
+
+def recording_path(record_dir, city_code, captured_at):
+    utc = captured_at.astimezone(datetime.timezone.utc)
+    return os.path.join(record_dir, city_code, utc.strftime(FILENAME_TIME_FORMAT) + ".html")
+
+
+def save_recording(record_dir, city_code, captured_at, html):
+    """captured_at(aware datetime) 시각의 테이블 HTML을 저장하고 경로를 반환합니다."""
+    path = recording_path(record_dir, city_code, captured_at)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return path
+
+
+def maybe_record(city_code, execution_timestamp, html):
+    """녹화가 켜져 있으면 저장합니다. 녹화 실패는 수집을 막지 않습니다."""
+    if not _record_dir:
+        return
+    try:
+        save_recording(_record_dir, city_code, datetime.datetime.fromisoformat(execution_timestamp), html)
+    except (OSError, ValueError) as e:
+        print(f"[record] Could not save recording for cityCode {city_code}: {e}")
+
+
+def load_recordings(record_dir):
+    """{지역코드: [(UTC datetime, 파일 경로)] 시각순}. 이름이 형식에 맞지 않는 파일은 건너뜁니다."""
+    recordings = {}
+    for path in glob.glob(os.path.join(record_dir, "*", "*.html")):
+        city_code = os.path.basename(os.path.dirname(path))
+        stem = os.path.splitext(os.path.basename(path))[0]
+        try:
+            captured_at = datetime.datetime.strptime(stem, FILENAME_TIME_FORMAT).replace(tzinfo=datetime.timezone.utc)
+        except ValueError:
+            continue
+        recordings.setdefault(city_code, []).append((captured_at, path))
+    for frames in recordings.values():
+        frames.sort()
+    return recordings
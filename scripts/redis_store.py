@@ -0,0 +1,160 @@
+import os
+import json
+import random
+import time
+import redis
+import redis.asyncio
+from metrics import incr, set_gauge
+
+# --- Upstash Redis 연결 풀과 저장 함수 ---
+# 연결 풀은 접속 정보별로 처음 쓰일 때 한 번만 만들어지고, 이후 호출은 열린 TLS 연결을 재사용합니다.
+# 로컬 redis-server로 시험할 때는 UPSTASH_REDIS_SSL=false 로 TLS를 끌 수 있습니다.
+
+MAX_CONNECTIONS = 8
+PUSH_RETRIES = 3
+PUSH_BACKOFF_BASE = 0.5 # 초, 시도마다 두 배
+PUSH_BACKOFF_CAP = 5.0
+TRANSIENT_ERRORS = (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)
+
+_pools = {}
+
+
+def get_redis_settings():
+    """환경 변수에서 Upstash Redis 접속 정보를 읽어옵니다."""
+    endpoint = os.environ.get("UPSTASH_REDIS_ENDPOINT")
+    port = os.environ.get("UPSTASH_REDIS_PORT")
+    password = os.environ.get("UPSTASH_REDIS_PASSWORD")
+    if not all([endpoint, port, password]):
+        print("Error: Upstash Redis connection details are not fully configured.")
+        raise ValueError("Missing Upstash Redis credentials in environment variables.")
+    return endpoint, port, password
+
+
+def _ssl_enabled():
+    return os.environ.get("UPSTASH_REDIS_SSL", "true").strip().lower() not in ("0", "false", "no")
+
+
+def get_redis_client(endpoint, port, password, ssl=None):
+    """접속 정보별로 공유되는 연결 풀 위에 Redis 클라이언트를 만들어 반환합니다."""
+    ssl = _ssl_enabled() if ssl is None else ssl
+    pool_key = (endpoint, int(port), password, ssl)
+    pool = _pools.get(pool_key)
+    if pool is None:
+        print(f"Creating Redis connection pool for {endpoint}:{port} (ssl={ssl})...")
+        pool = redis.ConnectionPool(
+            connection_class=redis.SSLConnection if ssl else redis.Connection,
+            host=endpoint,
+            port=int(port),
+            password=password,
+            max_connections=MAX_CONNECTIONS,
+            socket_keepalive=True,
+            health_check_interval=30,
+        )
+        _pools[pool_key] = pool
+    return redis.Redis(connection_pool=pool)
+
+
+def get_async_redis_client(endpoint, port, password, ssl=None):
+    """asyncio용 클라이언트 (live_relay.py의 Pub/Sub 구독용). 구독 연결은 오래 유지되므로 풀을 공유하지 않습니다."""
+    ssl = _ssl_enabled() if ssl is None else ssl
+    return redis.asyncio.Redis(host=endpoint, port=int(port), password=password, ssl=ssl, socket_keepalive=True, health_check_interval=30)
+
+
+def _serialize(data):
+    """이미 인코딩된 값(str/bytes)은 그대로, 나머지는 JSON 문자열로."""
+    if isinstance(data, (str, bytes)):
+        return data
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def _with_retry(operation, description, retries=PUSH_RETRIES):
+    """일시적인 연결 오류는 지수 백오프(+지터)로 재시도하고, 그 외 오류나 마지막 실패는 그대로 올립니다."""
+    for attempt in range(retries + 1):
+        try:
+            return operation()
+        except TRANSIENT_ERRORS as e:
+            if attempt == retries:
+                raise
+            delay = min(PUSH_BACKOFF_CAP, PUSH_BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.5, 1.0)
+            print(f"Transient Redis error during {description} (attempt {attempt + 1}/{retries + 1}): {e}. Retrying in {delay:.2f}s...")
+            incr("retries", kind="redis")
+            time.sleep(delay)
+
+
+def get_json_from_upstash_redis(key_name, endpoint, port, password, client=None):
+    """키에 저장된 JSON을 읽어옵니다. 키가 없거나 JSON이 아니면 None."""
+    r = client or get_redis_client(endpoint, port, password)
+    raw = _with_retry(lambda: r.get(key_name), f"read of {key_name}")
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError as e:
+        print(f"Could not decode JSON stored at '{key_name}': {e}")
+        return None
+
+
+def push_many_to_upstash_redis(items, endpoint, port, password, client=None, stream_entries=(), notifications=(), stream_deletes=()):
+    """
+    {키: 데이터}를 MULTI/EXEC 트랜잭션 하나로 저장합니다.
+    읽는 쪽은 원본과 계산 결과가 서로 다른 시점의 값으로 섞인 상태를 보지 않습니다.
+    stream_entries: 같은 트랜잭션에서 XADD할 (스트림 키, 필드 dict, 최대 길이, 엔트리 ID 또는 "*") 목록.
+    stream_deletes: 같은 트랜잭션에서 XDEL할 (스트림 키, 엔트리 ID) 목록.
+    notifications: 저장이 반영된 직후 PUBLISH할 (채널, 메시지) 목록. EXEC 안에서 SET 뒤에 실행되므로
+    구독자가 알림을 받았을 때는 키가 이미 새 값입니다.
+    EXEC가 반영된 뒤 응답을 받기 전에 연결이 끊길 수 있으므로, 재시도 전에 명시적 ID로 넣은 스트림 엔트리가 이미 있는지
+    확인하고 있으면 다시 보내지 않습니다 (이력 중복 XADD, 알림 중복 PUBLISH 방지).
+    그런 표식 엔트리 없이 알림을 보내는 트랜잭션은 중복 알림을 막을 수 없으므로 재시도하지 않습니다.
+    """
+    items = {key: data for key, data in items.items() if data}
+    if not items and not stream_entries:
+        print("No data to push to Redis.")
+        return
+
+    key_names = ", ".join(list(items) + [stream_key for stream_key, _, _, _ in stream_entries])
+    print(f"Attempting to push data to Upstash Redis (Endpoint: {endpoint}, Keys: {key_names})...")
+    payloads = {key: _serialize(data) for key, data in items.items()}
+    for key, payload in payloads.items():
+        set_gauge("payload_bytes", len(payload.encode("utf-8") if isinstance(payload, str) else payload), key=key)
+    r = client or get_redis_client(endpoint, port, password)
+    markers = [(stream_key, entry_id) for stream_key, _, _, entry_id in stream_entries if entry_id != "*"]
+    attempts = []
+
+    def already_applied():
+        return bool(markers) and all(r.xrange(stream_key, entry_id, entry_id) for stream_key, entry_id in markers)
+
+    def execute():
+        if attempts and already_applied():
+            print(f"Previous transaction for {key_names} was applied before the connection dropped; not sending it again.")
+            return None
+        attempts.append(1)
+        with r.pipeline(transaction=True) as pipe:
+            for key, payload in payloads.items():
+                pipe.set(key, payload)
+            for stream_key, entry_id in stream_deletes:
+                pipe.xdel(stream_key, entry_id)
+            for stream_key, fields, maxlen, entry_id in stream_entries:
+                pipe.xadd(stream_key, fields, id=entry_id, maxlen=maxlen, approximate=True)
+            for channel, message in notifications:
+                pipe.publish(channel, message)
+            return pipe.execute()
+
+    try:
+        _with_retry(execute, f"push of {key_names}", retries=PUSH_RETRIES if markers or not notifications else 0)
+        print(f"Data successfully pushed to Upstash Redis with keys: {key_names}")
+    except redis.exceptions.ConnectionError as e:
+        print(f"Redis ConnectionError for keys '{key_names}': Could not connect to Upstash Redis at {endpoint}:{port}. Error: {e}")
+        raise
+    except Exception as e:
+        print(f"An unexpected error occurred during Redis operation for keys '{key_names}': {e}")
+        raise
+
+
+def push_to_upstash_redis(data, endpoint, port, password, key_name, client=None):
+    """
+    추출된 데이터를 Upstash Redis에 JSON 문자열로 저장합니다.
+    """
+    if not data:
+        print(f"No data to push to Redis for key '{key_name}'.")
+        return
+    push_many_to_upstash_redis({key_name: data}, endpoint, port, password, client=client)
@@ -0,0 +1,48 @@
+import os
+
+# --- '시도' 드롭다운(select#cityCode)의 값 ---
+SIDO_CODES = {
+    "1100": "서울특별시",
+    "2600": "부산광역시",
+    "2700": "대구광역시",
+    "2800": "인천광역시",
+    "2900": "광주광역시",
+    "3000": "대전광역시",
+    "3100": "울산광역시",
+    "5100": "세종특별자치시",
+    "4100": "경기도",
+    "4200": "강원특별자치도",
+    "4300": "충청북도",
+    "4400": "충청남도",
+    "4500": "전북특별자치도",
+    "4600": "전라남도",
+    "4700": "경상북도",
+    "4800": "경상남도",
+    "4900": "제주특별자치도",
+}
+DEFAULT_REGION_CODES = ["2600"] # 부산광역시
+
+
+def parse_region_codes(value=None):
+    """
+    수집할 '시도' 코드 목록을 만듭니다.
+    value(또는 NEC_REGION_CODES 환경 변수)는 "all" 이거나 "1100,2600" 같은 쉼표 구분 문자열입니다.
+    """
+    if value is None:
+        value = os.environ.get("NEC_REGION_CODES", "")
+    value = value.strip()
+    if not value:
+        return list(DEFAULT_REGION_CODES)
+    if value.lower() == "all":
+        return list(SIDO_CODES)
+
+    codes = []
+    for code in value.split(","):
+        code = code.strip()
+        if not code:
+            continue
+        if code not in SIDO_CODES:
+            raise ValueError(f"Unknown 시도 code '{code}'. Known codes: {', '.join(SIDO_CODES)}")
+        if code not in codes:
+            codes.append(code)
+    return codes
@@ -0,0 +1,361 @@
+import argparse
+import bisect
+import contextlib
+import datetime
+import io
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import metrics
+import scrape_push
+from change_detect import empty_state
+from recordings import load_recordings, save_recording
+from regions import SIDO_CODES
+
+# --- 녹화 재생 / 부하 테스트 하네스 ---
+# NEC 사이트 없이 파이프라인 전체(HTTP 요청 -> 파싱 -> calculate_final_results -> 로컬 Redis 저장)를 돌려
+# 지연 시간 분포와 처리량을 측정합니다.
+#
+# 1) 녹화:  python scripts/scrape_push.py --watch --record recordings/2025-06-03
+# 2) 합성:  python scripts/replay_harness.py synthesize --out recordings/synthetic --regions 17 --rows 2000 --candidates 8
+# 3) 재생:  python scripts/replay_harness.py replay recordings/2025-06-03 --speed 60
+#
+# 재생 모드는 녹화를 electionInfo_report.xhtml 과 같은 경로로 내주는 로컬 HTTP 스텁을 띄우고 HTTP 수집의 base_url을 그쪽으로 돌립니다.
+# 스텁은 "재생 시계"(첫 녹화 시각 + 경과 시간 x speed) 기준으로 그 시점의 최신 녹화를 응답합니다.
+# 처리가 재생 속도를 따라가지 못하면 밀린 프레임은 건너뛰고(라이브 수집기와 같은 동작) 건너뛴 수를 보고합니다.
+# --speed 0 은 기다리지 않고 모든 프레임을 순서대로 최대한 빨리 처리합니다 (최대 처리량 측정).
+
+DEFAULT_SPEED = 60.0
+STUB_HOST = "127.0.0.1"
+REPLAY_METRICS_DIR = os.path.join("metrics", "replay")
+PERCENTILES = (50, 90, 99)
+
+
+# --- 합성 테이블 생성 ---
+def _format_count(value):
+    return f"{int(value):,}"
+
+
+def synthetic_city_codes(n_regions):
+    """실제 '시도' 코드를 먼저 쓰고, 모자라면 9로 시작하는 가상 코드를 붙입니다."""
+    codes = list(SIDO_CODES)[:n_regions]
+    codes += [f"9{index:04d}" for index in range(n_regions - len(codes))]
+    return codes
+
+
+class SyntheticRegion:
+    """
+    구시군별 선거인수, 투표수, 후보자 득표 비율, 개표 시작 시각/속도를 고정해 두고
+    진행 시점 t(0~1)의 결과 테이블을 만듭니다. 득표수는 t에 대해 단조 증가합니다.
+    """
+
+    def __init__(self, n_rows, candidate_names, rng):
+        self.candidate_names = list(candidate_names)
+        self.row_names = [f"구시군{index + 1:04d}" for index in range(n_rows)]
+        self.eligible = rng.integers(20_000, 400_000, size=n_rows)
+        self.cast = np.floor(self.eligible * rng.uniform(0.55, 0.85, size=n_rows))
+        base_shares = rng.dirichlet(np.full(len(candidate_names), 2.0))
+        self.shares = rng.dirichlet(base_shares * 50 + 0.5, size=n_rows) # 구시군마다 조금씩 다른 득표 비율
+        self.invalid_rate = rng.uniform(0.005, 0.03, size=n_rows)
+        self.start = rng.uniform(0.0, 0.6, size=n_rows)
+        self.duration = rng.uniform(0.2, 0.5, size=n_rows)
+
+    def counts(self, t):
+        progress = np.clip((t - self.start) / self.duration, 0.0, 1.0)
+        counted = np.floor(self.cast * progress)
+        invalid = np.floor(counted * self.invalid_rate)
+        votes = np.floor((counted - invalid)[:, None] * self.shares)
+        return votes, invalid
+
+    def table_html(self, t):
+        """page.inner_html("table#table01")과 같은 구조의 HTML (thead + tbody)."""
+        votes, invalid = self.counts(t)
+        candidate_total = votes.sum(axis=1)
+        turnout = np.where(self.cast > 0, (candidate_total + invalid) / self.cast * 100, 0.0)
+
+        def number_row(name, eligible, cast, row_votes, row_total, row_invalid, row_turnout):
+            cells = [eligible, cast, *row_votes, row_total, row_invalid, eligible - cast]
+            numbers = "".join(f'<td class="alignR">{_format_count(value)}</td>' for value in cells)
+            return f'<tr><td class="firstTh">{name}</td>{numbers}<td class="alignR">{row_turnout:.2f}</td></tr>'
+
+        def rate_row(cast, eligible, row_votes, row_total):
+            shares = [votes_ / row_total * 100 if row_total else 0.0 for votes_ in row_votes]
+            cells = "".join(f'<td class="alignR">({share:.2f})</td>' for share in shares)
+            cast_rate = cast / eligible * 100 if eligible else 0.0
+            return f'<tr class="rate"><td></td><td></td><td class="alignR">{cast_rate:.2f}</td>{cells}<td class="alignR">(100.00)</td><td></td><td></td><td></td></tr>'
+
+        header_cells = "".join(f'<td class="alignC"><strong>{name}</strong></td>' for name in self.candidate_names)
+        rows = [
+            f'<tr><td class="firstTh"></td><td></td><td></td>{header_cells}<td class="alignC"><strong>계</strong></td><td></td><td></td><td></td></tr>'
+        ]
+        total_eligible, total_cast = self.eligible.sum(), self.cast.sum()
+        total_votes, total_invalid = votes.sum(axis=0), invalid.sum()
+        total_turnout = (total_votes.sum() + total_invalid) / total_cast * 100 if total_cast else 0.0
+        rows.append(number_row("합계", total_eligible, total_cast, total_votes, total_votes.sum(), total_invalid, total_turnout))
+        rows.append(rate_row(total_cast, total_eligible, total_votes, total_votes.sum()))
+        for index, name in enumerate(self.row_names):
+            rows.append(number_row(name, self.eligible[index], self.cast[index], votes[index], candidate_total[index], invalid[index], turnout[index]))
+            rows.append(rate_row(self.cast[index], self.eligible[index], votes[index], candidate_total[index]))
+
+        n_candidates = len(self.candidate_names)
+        thead = (
+            '<thead><tr><th rowspan="2" scope="col">구시군명</th><th rowspan="2" scope="col">선거인수</th><th rowspan="2" scope="col">투표수</th>'
+            f'<th colspan="{n_candidates + 1}" scope="colgroup">후보자별 득표수</th><th rowspan="2" scope="col">무효<br>투표수</th>'
+            '<th rowspan="2" scope="col">기권수</th><th rowspan="2" scope="col">개표율</th></tr><tr><th scope="col">후보자명</th></tr></thead>'
+        )
+        return "<caption>개표진행상황</caption>\n" + thead + "\n<tbody>\n" + "\n".join(rows) + "\n</tbody>"
+
+
+def generate_recordings(out_dir, n_regions, n_rows, n_candidates, steps, interval_seconds, seed=0, start=None):
+    """
+    합성 지역 n_regions개를 steps 시점(interval_seconds 간격, 개표율 0% -> 100%)으로 녹화 디렉터리 구조에 씁니다.
+    반환값: 쓴 파일 수.
+    """
+    rng = np.random.default_rng(seed)
+    candidate_names = [f"후보{index + 1}" for index in range(n_candidates)]
+    start = start or datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+    written = 0
+    for city_code in synthetic_city_codes(n_regions):
+        region = SyntheticRegion(n_rows, candidate_names, rng)
+        for step in range(steps):
+            t = step / (steps - 1) if steps > 1 else 1.0
+            captured_at = start + datetime.timedelta(seconds=step * interval_seconds)
+            save_recording(out_dir, city_code, captured_at, region.table_html(t))
+            written += 1
+    return written
+
+
+# --- 재생용 HTTP 스텁 ---
+def _stub_document(table_inner_html):
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>'
+        f'<table id="table01" class="table01">{table_inner_html}</table></body></html>'
+    ).encode("utf-8")
+
+
+class ReplayClock:
+    """재생 시계. speed > 0 이면 실제 경과 시간 x speed, pin()을 쓰면 고정된 시각."""
+
+    def __init__(self, origin, speed):
+        self.origin = origin
+        self.speed = speed
+        self.started = time.monotonic()
+        self.pinned = None
+
+    def pin(self, recorded_at):
+        self.pinned = recorded_at
+
+    def now(self):
+        if self.pinned is not None:
+            return self.pinned
+        return self.origin + datetime.timedelta(seconds=(time.monotonic() - self.started) * self.speed)
+
+    def wall_time_for(self, recorded_at):
+        """녹화 시각이 재생 시계에 도달하는 monotonic 시각."""
+        return self.started + (recorded_at - self.origin).total_seconds() / self.speed
+
+
+class RecordingStore:
+    """지역별 녹화 목록에서 주어진 시각의 최신 HTML을 찾습니다. 같은 파일은 한 번만 읽습니다."""
+
+    def __init__(self, recordings):
+        self.times = {code: [captured_at for captured_at, _ in frames] for code, frames in recordings.items()}
+        self.paths = {code: [path for _, path in frames] for code, frames in recordings.items()}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def document_at(self, city_code, recorded_at):
+        times = self.times.get(city_code)
+        if not times:
+            return None
+        index = bisect.bisect_right(times, recorded_at) - 1
+        if index < 0:
+            return None
+        path = self.paths[city_code][index]
+        with self._lock:
+            document = self._cache.get(path)
+            if document is None:
+                with open(path, encoding="utf-8") as f:
+                    document = _stub_document(f.read())
+                self._cache[path] = document
+        return document
+
+
+def start_stub_server(store, clock, report_path):
+    """report_path?cityCode=... 요청에 재생 시계 기준 녹화를 응답하는 서버를 백그라운드 스레드로 띄웁니다."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # requests.Session의 keep-alive 연결을 그대로 재사용
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            city_code = parse_qs(parsed.query).get("cityCode", [None])[0]
+            document = store.document_at(city_code, clock.now()) if parsed.path == report_path else None
+            status = 200 if document else 404
+            body = document or b"not recorded"
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((STUB_HOST, 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --- 재생 ---
+def _percentiles(values):
+    if not values:
+        return {}
+    stats = {f"p{p}": float(np.percentile(values, p)) for p in PERCENTILES}
+    stats["max"] = float(max(values))
+    return stats
+
+
+def _format_stats(stats):
+    return ", ".join(f"{key} {value * 1000:.1f}ms" for key, value in stats.items()) or "n/a"
+
+
+def replay(record_dir, speed=DEFAULT_SPEED, redis_settings=None, incremental=False, max_concurrency=None, quiet=True):
+    """
+    녹화를 재생하며 프레임마다 HTTP 수집 -> 파싱 -> 계산 -> (redis_settings가 있으면) Redis 저장을 수행하고
+    지연 시간/처리량 보고서(dict)를 반환합니다.
+    """
+    recordings = load_recordings(record_dir)
+    if not recordings:
+        raise SystemExit(f"No recordings found in {record_dir} (expected <지역코드>/<시각>.html)")
+    frame_times = sorted({captured_at for frames in recordings.values() for captured_at, _ in frames})
+    city_codes = sorted(recordings)
+
+    clock = ReplayClock(frame_times[0], speed)
+    stub = start_stub_server(RecordingStore(recordings), clock, "/electioninfo/electionInfo_report.xhtml")
+    try:
+        stub_url = f"http://{STUB_HOST}:{stub.server_address[1]}"
+        if not os.environ.get("SCRAPER_METRICS_DIR"):
+            metrics.set_metrics_dir(REPLAY_METRICS_DIR)
+        print(f"Replaying {len(frame_times)} frame(s) for {len(city_codes)} region(s) from {record_dir} "
+              f"(speed {'max' if not speed else f'x{speed:g}'}, stub {stub_url})")
+
+        change_state = empty_state()
+        accumulators = {} if incremental else None
+        latencies, fetch_times, process_times = [], [], []
+        skipped = failed_frames = 0
+        frame_index = 0
+        run_started = time.monotonic()
+        if speed:
+            clock.started = run_started
+        while frame_index < len(frame_times):
+            if speed:
+                due = clock.wall_time_for(frame_times[frame_index])
+                if time.monotonic() < due:
+                    time.sleep(due - time.monotonic())
+                # 밀려 있으면 이미 도달한 프레임 중 가장 최신 것만 처리
+                latest = bisect.bisect_right(frame_times, clock.now()) - 1
+                skipped += max(0, latest - frame_index)
+                frame_index = max(frame_index, latest)
+                due = clock.wall_time_for(frame_times[frame_index])
+            else:
+                clock.pin(frame_times[frame_index])
+                due = time.monotonic()
+            execution_timestamp = frame_times[frame_index].isoformat()
+
+            output = io.StringIO() if quiet else sys.stdout
+            with contextlib.redirect_stdout(output):
+                try:
+                    fetch_started = time.monotonic()
+                    regions = scrape_push.scrape_regions_via_http(city_codes, execution_timestamp, max_concurrency, base_url=stub_url)
+                    fetched = time.monotonic()
+                    if not regions:
+                        raise RuntimeError("Stub returned no regions")
+                    failed = {code: "not recorded" for code in city_codes if code not in regions}
+                    snapshot = scrape_push.build_region_snapshot(execution_timestamp, city_codes, regions, failed)
+                    if redis_settings:
+                        change_state = scrape_push.publish_results(snapshot, redis_settings, change_state, accumulators)
+                    else:
+                        for scraped_data in regions.values():
+                            scrape_push.calculate_final_results(scraped_data)
+                    finished = time.monotonic()
+                    fetch_times.append(fetched - fetch_started)
+                    process_times.append(finished - fetched)
+                    latencies.append(finished - due)
+                except Exception as e:
+                    failed_frames += 1
+                    print(f"Frame {execution_timestamp} failed: {e}", file=sys.stderr)
+                metrics.flush(mode="replay")
+            frame_index += 1
+
+        elapsed = time.monotonic() - run_started
+    finally:
+        stub.shutdown()
+    processed = len(latencies)
+    busy = sum(fetch_times) + sum(process_times)
+    report = {
+        "frames": len(frame_times),
+        "processed": processed,
+        "skipped": skipped,
+        "failed": failed_frames,
+        "regions": len(city_codes),
+        "elapsed_s": elapsed,
+        "snapshots_per_s": processed / elapsed if elapsed else 0.0,
+        "busy_snapshots_per_s": processed / busy if busy else 0.0,
+        "latency": _percentiles(latencies),
+        "fetch_parse": _percentiles(fetch_times),
+        "calculate_publish": _percentiles(process_times),
+    }
+    print(f"Processed {processed}/{len(frame_times)} frame(s) ({skipped} skipped, {failed_frames} failed) in {elapsed:.2f}s")
+    print(f"Throughput: {report['snapshots_per_s']:.2f} snapshots/s wall, {report['busy_snapshots_per_s']:.2f} snapshots/s busy")
+    print(f"End-to-end latency: {_format_stats(report['latency'])}")
+    print(f"  fetch+parse:       {_format_stats(report['fetch_parse'])}")
+    print(f"  calculate+publish: {_format_stats(report['calculate_publish'])}")
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="녹화된 NEC 결과 테이블로 수집 파이프라인을 재생하고 지연 시간/처리량을 측정합니다.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    synth = subparsers.add_parser("synthesize", help="합성 결과 테이블 녹화를 만듭니다.")
+    synth.add_argument("--out", required=True, help="녹화를 쓸 디렉터리.")
+    synth.add_argument("--regions", type=int, default=17, help="지역 수 (17개를 넘으면 가상 코드 사용).")
+    synth.add_argument("--rows", type=int, default=250, help="지역당 구시군 행 수.")
+    synth.add_argument("--candidates", type=int, default=5, help="후보자 수.")
+    synth.add_argument("--steps", type=int, default=60, help="지역당 녹화 시점 수 (개표율 0%% -> 100%%).")
+    synth.add_argument("--interval", type=float, default=60.0, help="녹화 시점 간격(초).")
+    synth.add_argument("--seed", type=int, default=0)
+
+    rep = subparsers.add_parser("replay", help="녹화를 로컬 HTTP 스텁으로 재생하며 파이프라인을 실행합니다.")
+    rep.add_argument("record_dir", help="녹화 디렉터리 (<지역코드>/<시각>.html).")
+    rep.add_argument("--speed", type=float, default=DEFAULT_SPEED, help="재생 배속 (기본 60배, 0이면 기다리지 않고 최대 속도).")
+    rep.add_argument("--redis-host", default="localhost", help="결과를 저장할 로컬 Redis 주소.")
+    rep.add_argument("--redis-port", type=int, default=6379)
+    rep.add_argument("--redis-password", default=None)
+    rep.add_argument("--redis-ssl", action="store_true", help="Redis에 TLS로 접속합니다 (기본은 평문).")
+    rep.add_argument("--no-redis", action="store_true", help="Redis 저장 없이 파싱과 calculate_final_results까지만 측정합니다.")
+    rep.add_argument("--incremental", action="store_true", help="watch 모드처럼 지역별 누적 추정(ProjectionAccumulator)을 사용합니다.")
+    rep.add_argument("--concurrency", type=int, default=None, help="동시에 요청할 최대 지역 수 (기본: 모든 지역을 한 번에).")
+    rep.add_argument("--verbose", action="store_true", help="파이프라인 로그를 그대로 출력합니다.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "synthesize":
+        written = generate_recordings(args.out, args.regions, args.rows, args.candidates, args.steps, args.interval, args.seed)
+        print(f"Wrote {written} synthetic recording(s) to {args.out}")
+        return
+    os.environ["UPSTASH_REDIS_SSL"] = "true" if args.redis_ssl else "false"
+    redis_settings = None if args.no_redis else (args.redis_host, args.redis_port, args.redis_password)
+    replay(args.record_dir, args.speed, redis_settings, args.incremental, args.concurrency, quiet=not args.verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlparse
+from metrics import incr, set_gauge
+
+# --- Playwright 요청 가로채기 (선택 사항) ---
+# 결과 페이지에서 읽는 것은 table#table01 뿐이므로 이미지, 스타일시트, 폰트, 미디어와 외부 분석 스크립트는 받지 않고 끊습니다.
+# 페이지 동작에 필요한 NEC 자체 정적 스크립트는 처음 한 번만 내려받아 디스크 캐시에 두고,
+# 이후에는 route.fulfill()로 캐시에서 바로 응답합니다. 문서, XHR 등 나머지 요청은 그대로 통과합니다.
+# 켜는 방법: scrape_push.py --block-resources 또는 NEC_BLOCK_RESOURCES=true
+# NEC_BLOCK_RESOURCE_TYPES(쉼표 구분)로 끊을 리소스 종류를, NEC_ASSET_CACHE_DIR로 캐시 위치를 바꿀 수 있습니다.
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font", "stylesheet")
+BLOCKED_HOST_KEYWORDS = ("google-analytics", "googletagmanager", "doubleclick", "facebook", "wcs.naver", "analytics")
+ASSET_CACHE_DIR = os.environ.get("NEC_ASSET_CACHE_DIR", "asset-cache")
+ASSET_CACHE_TTL_SECONDS = 6 * 60 * 60 # 선거 당일 중 스크립트가 바뀌어도 몇 시간 안에 따라가도록
+_DROPPED_HEADERS = ("content-length", "content-encoding", "transfer-encoding") # route.fetch()의 본문은 이미 풀려 있음
+
+
+def resource_blocking_enabled(flag=False):
+    """--block-resources 플래그 또는 NEC_BLOCK_RESOURCES 환경 변수가 켜져 있는지."""
+    env_value = os.environ.get("NEC_BLOCK_RESOURCES", "").strip().lower()
+    return flag or env_value in ("1", "true", "yes")
+
+
+def _blocked_types_from_env():
+    value = os.environ.get("NEC_BLOCK_RESOURCE_TYPES")
+    if not value:
+        return DEFAULT_BLOCKED_RESOURCE_TYPES
+    return tuple(part.strip() for part in value.split(",") if part.strip())
+
+
+def _atomic_write(path, content):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class ResourcePolicy:
+    """
+    요청마다 끊을지(block), 캐시로 응답할지(cache), 그대로 보낼지(pass) 정하고 절약량을 집계합니다.
+    install_async()로 브라우저 컨텍스트에 붙이며, 여러 컨텍스트가 같은 정책(캐시와 집계)을 공유합니다.
+    """
+
+    def __init__(self, first_party_host, cache_dir=ASSET_CACHE_DIR, blocked_types=None, ttl_seconds=ASSET_CACHE_TTL_SECONDS):
+        self.first_party_host = first_party_host
+        self.cache_dir = cache_dir
+        self.blocked_types = frozenset(blocked_types or _blocked_types_from_env())
+        self.ttl_seconds = ttl_seconds
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"blocked_requests": 0, "cache_hits": 0, "cache_hit_bytes": 0, "cache_misses": 0, "passed_requests": 0}
+
+    # --- 분류 ---
+    def classify(self, resource_type, url):
+        host = urlparse(url).hostname or ""
+        if resource_type in self.blocked_types:
+            return "block"
+        if resource_type == "script":
+            if host != self.first_party_host or any(keyword in url for keyword in BLOCKED_HOST_KEYWORDS):
+                return "block"
+            return "cache"
+        return "pass"
+
+    # --- 디스크 캐시 ---
+    def _cache_paths(self, url):
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".body"), os.path.join(self.cache_dir, digest + ".json")
+
+    def load_cached(self, url):
+        """(본문 bytes, 헤더 dict, 상태 코드) 또는 캐시가 없거나 만료됐으면 None."""
+        body_path, meta_path = self._cache_paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if time.time() - meta.get("stored_at", 0) > self.ttl_seconds:
+                return None
+            with open(body_path, "rb") as f:
+                return f.read(), meta.get("headers", {}), meta.get("status", 200)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url, status, headers, body):
+        """200 응답만 저장합니다. 여러 컨텍스트가 같은 파일을 쓸 수 있어 임시 파일에 쓴 뒤 교체합니다."""
+        if status != 200:
+            return
+        headers = {key: value for key, value in headers.items() if key.lower() not in _DROPPED_HEADERS}
+        body_path, meta_path = self._cache_paths(url)
+        meta = {"url": url, "status": status, "headers": headers, "stored_at": time.time()}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _atomic_write(body_path, body)
+            _atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8")) # 메타를 나중에 써야 본문 없는 캐시가 생기지 않음
+        except OSError as e:
+            print(f"[resources] Could not cache {url}: {e}")
+
+    # --- Playwright 핸들러 ---
+    async def handle_async(self, route):
+        """async API용 route 핸들러."""
+        request = route.request
+        action = self.classify(request.resource_type, request.url)
+        if action == "block":
+            self.stats["blocked_requests"] += 1
+            return await route.abort()
+        if action == "cache":
+            cached = self.load_cached(request.url)
+            if cached:
+                return await self._fulfill_from_cache(route, cached)
+            response = await route.fetch()
+            body = await response.body()
+            self._record_miss(request.url, response.status, response.headers, body)
+            return await route.fulfill(response=response)
+        self.stats["passed_requests"] += 1
+        return await route.continue_()
+
+    def _fulfill_from_cache(self, route, cached):
+        body, headers, status = cached
+        self.stats["cache_hits"] += 1
+        self.stats["cache_hit_bytes"] += len(body)
+        return route.fulfill(status=status, headers=headers, body=body)
+
+    def _record_miss(self, url, status, headers, body):
+        self.stats["cache_misses"] += 1
+        self.store(url, status, headers, body)
+
+    async def install_async(self, context):
+        await context.route("**/*", self.handle_async)
+
+    def report(self, **labels):
+        """
+        이번 실행에서 절약한 요청 수와 바이트를 출력하고 메트릭에 남긴 뒤 집계를 초기화합니다.
+        끊은 요청은 응답을 받지 않으므로 크기를 알 수 없어 요청 수만 셉니다. 바이트는 캐시로 응답한 만큼입니다.
+        """
+        stats = self.stats
+        saved_requests = stats["blocked_requests"] + stats["cache_hits"]
+        print(
+            f"[resources] Saved {saved_requests} request(s) "
+            f"({stats['blocked_requests']} blocked, {stats['cache_hits']} served from cache = {stats['cache_hit_bytes']} bytes); "
+            f"{stats['cache_misses']} script(s) downloaded into cache, {stats['passed_requests']} passed through."
+        )
+        for reason, count in (("blocked", stats["blocked_requests"]), ("cache", stats["cache_hits"])):
+            if count:
+                incr("requests_saved", count, reason=reason, **labels)
+        set_gauge("bytes_saved_from_cache", stats["cache_hit_bytes"], **labels)
+        summary = dict(stats, saved_requests=saved_requests)
+        self.reset_stats()
+        return summary
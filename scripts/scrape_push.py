@@ -1,103 +1,42 @@
 import os
+import argparse
+import asyncio
 import time
-import json 
-import redis 
-from playwright.sync_api import sync_playwright, TimeoutError
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from playwright.async_api import async_playwright, TimeoutError
 import datetime # 타임스탬프용
+from urllib.parse import urlparse
+import numpy as np
+from nec_http import REPORT_PATH, fetch_table_html
+from nec_parser import parse_result_html, table_from_entries
+from redis_store import get_json_from_upstash_redis, get_redis_settings, push_many_to_upstash_redis
+from change_detect import count_changed_rows, detect_changes
+from wire_format import build_wire_snapshot, encode as encode_wire, legacy_region, usable_codec
+from notifications import NOTIFY_CHANNEL, build_notification
+from history import HISTORY_MAXLEN, HISTORY_STREAM_KEY, encode_snapshot as encode_history_snapshot, plan_append as plan_history_append
+from projection import (
+    DEFAULT_CONFIDENCE_LEVEL, ProjectionAccumulator, analytic_intervals,
+    build_projection_inputs, interval_from_variance, project_votes,
+)
+from regions import parse_region_codes
+from recordings import maybe_record, set_record_dir
+from poll_scheduler import (
+    DEFAULT_JITTER, DEFAULT_MAX_INTERVAL_SECONDS, DEFAULT_MIN_INTERVAL_SECONDS, AdaptivePollScheduler, region_turnouts,
+)
+from resource_filter import ResourcePolicy, resource_blocking_enabled
+import metrics
+from metrics import incr, set_gauge, span
 
-# --- Upstash Redis로 데이터를 전송하는 함수 ---
-def push_to_upstash_redis(data, endpoint, port, password, key_name):
-    """
-    추출된 데이터를 Upstash Redis에 JSON 문자열로 저장합니다.
-    """
-    if not data:
-        print(f"No data to push to Redis for key '{key_name}'.")
-        return
-
-    print(f"Attempting to push data to Upstash Redis (Endpoint: {endpoint}, Key: {key_name})...")
-    
-    try:
-        r = redis.Redis(
-            host=endpoint,
-            port=int(port),
-            password=password,
-            ssl=True 
-        )
-        r.ping()
-        print(f"Successfully connected to Upstash Redis for key '{key_name}'.")
-        json_data = json.dumps(data, ensure_ascii=False, default=str) 
-        r.set(key_name, json_data)
-        print(f"Data successfully pushed to Upstash Redis with key '{key_name}'.")
-        
-    except redis.exceptions.ConnectionError as e:
-        print(f"Redis ConnectionError for key '{key_name}': Could not connect to Upstash Redis at {endpoint}:{port}. Error: {e}")
-        raise 
-    except Exception as e:
-        print(f"An unexpected error occurred during Redis operation for key '{key_name}': {e}")
-        raise 
 
 # --- 최종 결과 계산 함수 ---
-def calculate_final_results(scraped_data_from_redis):
-    """
-    수집된 데이터를 바탕으로 최종 결과를 계산합니다.
-    입력: {'timestamp': ..., 'candidates': [...], 'data': [시군구별 상세 데이터], 'summary': {전체 요약}}
-    출력: {'timestamp': ..., 
-           'total_actual_votes': ..., 
-           'projected_votes_by_candidate': {...}, 
-           'projected_invalid_votes': ..., 
-           'overall_turnout_rate_percent': ...}
-    """
-    timestamp = scraped_data_from_redis.get("timestamp")
-    candidate_names = scraped_data_from_redis.get("candidates")
-    sigungu_data_list = scraped_data_from_redis.get("data")
-    summary_data = scraped_data_from_redis.get("summary", {})
-
-    if not candidate_names or not sigungu_data_list:
-        print("Error: Candidate names or sigungu data is missing for calculation.")
-        return {"error": "Missing candidate names or data for calculation", "timestamp": timestamp}
-
-    print(f"Calculating final results for candidates: {candidate_names} based on data from {timestamp}")
-    
+def _final_results_payload(scraped_data, candidate_names, projected_totals, projected_invalid, eligible_total, confidence_intervals):
+    """추정 합계(반올림 전)로 Redis에 저장할 최종 결과 dict를 만듭니다."""
+    timestamp = scraped_data.get("timestamp")
+    summary_data = scraped_data.get("summary", {})
     total_actual_votes = int(str(summary_data.get("투표수", "0")).replace(',', ''))
-    projected_votes_by_candidate = {name: 0.0 for name in candidate_names}
-    projected_invalid_votes_total = 0.0
-    overall_total_eligible_voters_for_projection = 0 
-
-    for sigungu in sigungu_data_list:
-        try:
-            sigungu_name = sigungu.get('구시군명', 'N/A')
-            eligible_voters_sigungu = int(str(sigungu.get("선거인수", "0")).replace(',', ''))
-            votes_cast_sigungu_actual = int(str(sigungu.get("투표수", "0")).replace(',', ''))
-            invalid_votes_sigungu_actual = int(str(sigungu.get("무효투표수", "0")).replace(',', ''))
-            
-            overall_total_eligible_voters_for_projection += eligible_voters_sigungu
-
-            if votes_cast_sigungu_actual == 0:
-                print(f"Warning: Actual votes cast is 0 for {sigungu_name}. Skipping projection for this sigungu.")
-                continue
-
-            for cand_name in candidate_names:
-                candidate_votes_sigungu_actual = int(str(sigungu.get(cand_name, "0")).replace(',', ''))
-                vote_share_in_sigungu = candidate_votes_sigungu_actual / votes_cast_sigungu_actual
-                projected_votes_for_candidate_in_sigungu = vote_share_in_sigungu * eligible_voters_sigungu
-                projected_votes_by_candidate[cand_name] += projected_votes_for_candidate_in_sigungu
-            
-            invalid_vote_share_in_sigungu = invalid_votes_sigungu_actual / votes_cast_sigungu_actual
-            projected_invalid_votes_sigungu = invalid_vote_share_in_sigungu * eligible_voters_sigungu
-            projected_invalid_votes_total += projected_invalid_votes_sigungu
-        
-        except ValueError as ve:
-            print(f"ValueError converting data for sigungu {sigungu_name} during projection: {ve}. Row data: {sigungu}")
-            continue 
-        except ZeroDivisionError:
-            print(f"ZeroDivisionError for sigungu {sigungu_name} (actual votes_cast_sigungu is 0) during projection. Skipping.")
-            continue
-    
-    for cand_name in projected_votes_by_candidate:
-        projected_votes_by_candidate[cand_name] = round(projected_votes_by_candidate[cand_name])
-    
-    projected_invalid_votes_total = round(projected_invalid_votes_total)
+    projected_votes_by_candidate = {
+        name: round(float(total)) for name, total in zip(candidate_names, projected_totals)
+    }
 
     overall_turnout_rate_str = str(summary_data.get("개표율", "0")).replace('%', '').strip()
     overall_turnout_rate = float(overall_turnout_rate_str) if overall_turnout_rate_str else 0.0
@@ -106,288 +45,732 @@ def calculate_final_results(scraped_data_from_redis):
         "timestamp": timestamp,
         "total_actual_votes": total_actual_votes,
         "projected_votes_by_candidate": projected_votes_by_candidate,
-        "projected_invalid_votes": projected_invalid_votes_total,
+        "projected_invalid_votes": round(projected_invalid),
         "overall_turnout_rate_percent": overall_turnout_rate,
         "calculation_info": {
             "candidate_projection_method": "Sum_for_each_candidate_over_sigungus_of ((candidate_actual_votes_in_sigungu / total_actual_votes_in_sigungu) * eligible_voters_in_sigungu)",
             "invalid_vote_projection_method": "Sum_over_sigungus_of ((sigungu_actual_invalid_votes / sigungu_total_actual_votes) * sigungu_eligible_voters)",
-            "total_eligible_voters_used_for_projection": overall_total_eligible_voters_for_projection,
+            "total_eligible_voters_used_for_projection": eligible_total,
             "source_overall_actual_votes": summary_data.get("투표수", "N/A"),
             "source_overall_actual_invalid_votes": summary_data.get("무효투표수", "N/A"),
             "source_overall_turnout_rate": summary_data.get("개표율", "N/A")
         }
     }
+    if confidence_intervals:
+        final_results["confidence_intervals"] = confidence_intervals
     print(f"Final calculated results: {final_results}")
     return final_results
 
 
-def crawl_once():
-    UPSTASH_REDIS_ENDPOINT = os.environ.get("UPSTASH_REDIS_ENDPOINT")
-    UPSTASH_REDIS_PORT = os.environ.get("UPSTASH_REDIS_PORT")
-    UPSTASH_REDIS_PASSWORD = os.environ.get("UPSTASH_REDIS_PASSWORD")
-    RAW_DATA_REDIS_KEY = "live_election_data" 
-    PROJECTED_DATA_REDIS_KEY = "live_election_data_projected_final"
+def _confidence_payload(method, level, candidate_names, lower, upper):
+    return {
+        "method": method,
+        "level": level,
+        "by_candidate": {
+            name: [round(float(lo)), round(float(hi))] for name, lo, hi in zip(candidate_names, lower, upper)
+        },
+    }
 
-    scraped_data_for_redis = None 
-    page = None
-    browser = None
-    screenshot_dir = "playwright-screenshots" 
-    os.makedirs(screenshot_dir, exist_ok=True)
-    current_utc_time = datetime.datetime.now(datetime.timezone.utc)
-    execution_timestamp = current_utc_time.isoformat() 
-    file_timestamp = current_utc_time.strftime("%Y%m%d-%H%M%S")
 
-    if not all([UPSTASH_REDIS_ENDPOINT, UPSTASH_REDIS_PORT, UPSTASH_REDIS_PASSWORD]):
-        print("Error: Upstash Redis connection details are not fully configured.")
-        raise ValueError("Missing Upstash Redis credentials in environment variables.")
+def _missing_input_error(scraped_data):
+    if not scraped_data.get("candidates") or not scraped_data.get("data"):
+        print("Error: Candidate names or sigungu data is missing for calculation.")
+        return {"error": "Missing candidate names or data for calculation", "timestamp": scraped_data.get("timestamp")}
+    return None
 
-    with sync_playwright() as p:
-        try:
-            print(f"Starting crawl at {execution_timestamp}")
-            print("Launching browser...")
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) "
-                    "Gecko/20100101 Firefox/123.0"
-                ),
-                viewport={'width': 1280, 'height': 1024} 
-            )
-            page = context.new_page()
-            page.set_default_timeout(30_000)
 
-            target_page_url = "http://info.nec.go.kr/main/showDocument.xhtml?electionId=0020250402&topMenuId=VC&secondMenuId=VCCP09"
-            print(f"Step 1: Navigating to target page: {target_page_url}")
-            page.goto(target_page_url, wait_until="domcontentloaded", timeout=60_000)
-            print("Step 1: Target page navigation completed.")
-            
-            election_type_selector = "#electionId11"
-            sido_dropdown_selector = "select#cityCode"
-            search_button_selector = '#spanSubmit input[type="image"][alt="검색"]'
+def calculate_final_results(scraped_data_from_redis, ci_method="analytic", ci_level=DEFAULT_CONFIDENCE_LEVEL):
+    """
+    수집된 데이터를 바탕으로 최종 결과를 계산합니다.
+    입력: {'timestamp': ..., 'candidates': [...], 'data': [시군구별 상세 데이터], 'summary': {전체 요약}}
+    출력: {'timestamp': ..., 
+           'total_actual_votes': ..., 
+           'projected_votes_by_candidate': {...}, 
+           'projected_invalid_votes': ..., 
+           'overall_turnout_rate_percent': ...,
+           'confidence_intervals': {...}}
+    ci_method: "analytic"(정규근사) 또는 None(신뢰구간 생략)
+    """
+    error = _missing_input_error(scraped_data_from_redis)
+    if error:
+        return error
+    print(f"Calculating final results for candidates: {scraped_data_from_redis.get('candidates')} based on data from {scraped_data_from_redis.get('timestamp')}")
 
-            print(f"Step 2: Clicking on election type tab: '{election_type_selector}'")
-            try:
-                page.locator(election_type_selector).wait_for(state="visible", timeout=15000)
-                page.locator(election_type_selector).click(timeout=10000)
-                print("Step 2: Election type tab clicked.")
-                
-                print(f"Waiting for '{sido_dropdown_selector}' and '{search_button_selector}' to be ready after election type click...")
-                page.wait_for_selector(sido_dropdown_selector, state="visible", timeout=15000)
-                print(f"'{sido_dropdown_selector}' is now visible.")
-                page.locator(search_button_selector).wait_for(state="visible", timeout=15000)
-                print(f"'{search_button_selector}' is now visible.")
-            except TimeoutError as e:
-                print(f"Timeout during Step 2 (election type click or initial element visibility): {e}")
-                screenshot_path = os.path.join(screenshot_dir, f"error_step2_timeout_{file_timestamp}.png")
-                if page: page.screenshot(path=screenshot_path, full_page=True)
-                raise
-            except Exception as e:
-                print(f"Error during Step 2 (election type click or initial element visibility): {e}")
-                screenshot_path = os.path.join(screenshot_dir, f"error_step2_exception_{file_timestamp}.png")
-                if page: page.screenshot(path=screenshot_path, full_page=True)
-                raise
-
-            print(f"Step 3: Selecting '시도' dropdown (부산광역시) using selector '{sido_dropdown_selector}'...")
-            page.select_option(sido_dropdown_selector, "2600") 
-            print("Step 3: '시도' (부산광역시) selected.")
-            
-            print(f"Waiting for search button '{search_button_selector}' to be ready after '시도' selection...")
-            try:
-                page.locator(search_button_selector).wait_for(state="visible", timeout=10000) 
-                if not page.locator(search_button_selector).is_enabled(timeout=5000):
-                    print("Warning: Search button is visible but reported as not enabled shortly after Sido selection. Proceeding with click.")
-                print("Search button is confirmed to be targetable.")
-            except TimeoutError as e:
-                print(f"Timeout waiting for search button to be ready/enabled after '시도' selection: {e}")
-                screenshot_path = os.path.join(screenshot_dir, f"error_search_button_not_ready_after_sido_timeout_{file_timestamp}.png")
-                if page: page.screenshot(path=screenshot_path, full_page=True)
-                raise
-            
-            print(f"Step 4: Clicking search button ('{search_button_selector}')...")
-            page.locator(search_button_selector).click(timeout=15000) 
-            print("Step 4: Search button clicked.")
+    inputs = build_projection_inputs(scraped_data_from_redis)
+    for idx in np.flatnonzero(inputs.valid & (inputs.votes_cast == 0)):
+        print(f"Warning: Actual votes cast is 0 for {inputs.row_names[idx]}. Skipping projection for this sigungu.")
+    projected_totals, projected_invalid = project_votes(inputs)
 
-            table_selector = "table#table01" 
-            print(f"Step 5: Waiting for table ('{table_selector}') to load after search...")
-            page.wait_for_selector(table_selector, timeout=60_000)
-            print("Step 5: Result table loaded.")
+    confidence_intervals = None
+    if ci_method == "analytic":
+        lower, upper = analytic_intervals(inputs, ci_level)
+        confidence_intervals = _confidence_payload(ci_method, ci_level, inputs.candidate_names, lower, upper)
 
-            print(f"Step 6: Extracting HTML from '{table_selector}'...")
-            html = page.inner_html(table_selector)
-            print("Step 6: HTML extraction completed.")
+    return _final_results_payload(
+        scraped_data_from_redis, inputs.candidate_names, projected_totals, projected_invalid,
+        int(inputs.eligible[inputs.valid].sum()), confidence_intervals
+    )
 
-            print("Step 7: Parsing HTML with BeautifulSoup...")
-            soup = BeautifulSoup(html, "lxml")
-            
-            # --- 후보자 이름 추출 로직 변경 ---
-            candidate_names = []
-            tbody = soup.find("tbody")
-            if not tbody: raise ValueError("Parsing Error: Could not find <tbody> in the table HTML.")
-            
-            first_tr_in_tbody = tbody.find("tr") # <tbody>의 첫 번째 <tr> (후보자 이름 포함된 행)
-            if not first_tr_in_tbody: 
-                raise ValueError("Parsing Error: Could not find the first row in <tbody> for candidate names.")
-            
-            # <td> 태그들을 순회하며 <strong> 태그 안의 텍스트를 후보자 이름으로 간주
-            # HTML 구조상 후보자 이름은 특정 class="alignC"를 가진 <td> 안에 strong 태그로 있음
-            # "계" 이전까지의 strong 태그 텍스트를 가져옴
-            candidate_tds = first_tr_in_tbody.find_all("td", class_="alignC")
-            for td_cand in candidate_tds:
-                strong_tag = td_cand.find("strong")
-                if strong_tag:
-                    name = strong_tag.get_text(strip=True)
-                    if name == "계": # "계" 컬럼은 후보자가 아님
-                        break
-                    if name: # 이름이 비어있지 않으면 추가
-                        candidate_names.append(name)
-            
-            if not candidate_names:
-                # 만약 위 방식으로 못찾으면, thead의 두번째 tr의 th에서 다시 시도 (이전 방식 - fallback은 아님, 구조가 명확하므로)
-                # 이 부분은 제공해주신 HTML 구조에 따라 tbody에서 가져오는 것이 맞음.
-                raise ValueError("Critical Parsing Error: Candidate names could not be extracted from the first row of <tbody>.")
-            print(f"Dynamically extracted candidate names: {candidate_names}")
-            
-            # --- 데이터 행 및 합계 행 파싱 로직 수정 ---
-            sigungu_data_list = []
-            summary_row_data = {} 
-            data_rows = tbody.find_all("tr") 
+
+def calculate_final_results_incremental(scraped_data, accumulator, region_delta=None, ci_level=DEFAULT_CONFIDENCE_LEVEL):
+    """
+    calculate_final_results와 같은 결과를 ProjectionAccumulator로 계산합니다.
+    region_delta(change_detect의 지역별 delta)가 있으면 바뀐 행만 다시 계산하고, 없거나 전체 갱신이면 처음부터 만듭니다.
+    신뢰구간은 구시군별 분산도 더해지는 값이므로 정규근사(analytic)로 함께 갱신합니다.
+    """
+    error = _missing_input_error(scraped_data)
+    if error:
+        return error
+
+    if region_delta is None or region_delta.get("full") or not accumulator.rows:
+        updated_rows = accumulator.reset(scraped_data)
+    else:
+        updated_rows = accumulator.apply(scraped_data["candidates"], region_delta.get("changed", {}).values(), region_delta.get("removed", ()))
+    print(f"Incrementally updated projection for {updated_rows}/{len(scraped_data['data'])} sigungu row(s).")
+
+    projected_totals, projected_invalid, eligible_total, variance = accumulator.projection()
+    lower, upper = interval_from_variance(projected_totals, variance, ci_level)
+    confidence_intervals = _confidence_payload("analytic", ci_level, accumulator.candidates, lower, upper)
+    return _final_results_payload(scraped_data, accumulator.candidates, projected_totals, projected_invalid, eligible_total, confidence_intervals)
+
+
+# --- NEC 개표 결과 페이지 관련 상수 ---
+TARGET_PAGE_URL = "http://info.nec.go.kr/main/showDocument.xhtml?electionId=0020250402&topMenuId=VC&secondMenuId=VCCP09"
+ELECTION_TYPE_SELECTOR = "#electionId11"
+SIDO_DROPDOWN_SELECTOR = "select#cityCode"
+SEARCH_BUTTON_SELECTOR = '#spanSubmit input[type="image"][alt="검색"]'
+TABLE_SELECTOR = "table#table01"
+FRESH_TABLE_SELECTOR = f"{TABLE_SELECTOR}:not([data-previous-search])" # 직전 검색에서 남은 테이블에는 검색 전에 이 속성을 붙임
+DEFAULT_CITY_CODE = "2600" # 부산광역시
+DEFAULT_MAX_CONCURRENCY = 6 # 동시에 띄울 브라우저 컨텍스트(페이지) 수. HTTP 요청은 지역 수만큼 한 번에 보냄
+BROWSER_CONTEXT_OPTIONS = {
+    "user_agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) "
+        "Gecko/20100101 Firefox/123.0"
+    ),
+    "viewport": {'width': 1280, 'height': 1024},
+}
+
+RAW_DATA_REDIS_KEY = "live_election_data"
+PROJECTED_DATA_REDIS_KEY = "live_election_data_projected_final"
+RAW_DATA_BY_REGION_REDIS_KEY = "live_election_data_by_region"
+PROJECTED_DATA_BY_REGION_REDIS_KEY = "live_election_data_projected_by_region"
+DELTA_REDIS_KEY = "live_election_data_delta" # 직전 버전 대비 바뀐 구시군 행
+CHANGE_STATE_REDIS_KEY = "live_election_data_state" # 버전과 지역/행별 fingerprint
+# 정수 배열 기반 v2 형식 (원본 + 계산 결과). 기존 키들은 전환 기간 동안 그대로 함께 저장
+WIRE_DATA_REDIS_KEY = "live_election_data_v2"
+WIRE_FORMAT_CODEC = usable_codec(os.environ.get("WIRE_FORMAT_CODEC", "zjson")) # json | zjson | msgpack. 쓸 수 없으면 시작 시 zjson으로
+SCREENSHOT_DIR = "playwright-screenshots"
+
+
+async def _save_screenshot(page, name, file_timestamp):
+    """오류 발생 시 디버깅용 스크린샷을 남깁니다. 스크린샷 실패는 무시합니다."""
+    if not page:
+        return
+    screenshot_path = os.path.join(SCREENSHOT_DIR, f"{name}_{file_timestamp}.png")
+    try: await page.screenshot(path=screenshot_path, full_page=True)
+    except Exception as se: print(f"Could not save screenshot: {se}")
+
+
+async def launch_browser(p, resource_policy=None):
+    """Chromium을 띄우고 스크래핑용 브라우저 컨텍스트를 만듭니다. resource_policy가 있으면 요청 가로채기를 붙입니다."""
+    print("Launching browser...")
+    browser = await p.chromium.launch(headless=True)
+    context = await browser.new_context(**BROWSER_CONTEXT_OPTIONS)
+    if resource_policy:
+        await resource_policy.install_async(context)
+    return browser, context
+
+
+def build_resource_policy(block_resources=False):
+    """--block-resources 또는 NEC_BLOCK_RESOURCES가 켜져 있으면 결과 페이지 호스트 기준의 ResourcePolicy를, 아니면 None."""
+    if not resource_blocking_enabled(block_resources):
+        return None
+    print("Resource blocking enabled: images/styles/fonts are aborted and NEC scripts are served from the local cache.")
+    return ResourcePolicy(urlparse(TARGET_PAGE_URL).hostname)
+
+
+async def open_result_page(context, file_timestamp, city_code=DEFAULT_CITY_CODE):
+    """
+    새 페이지를 열어 결과 페이지로 이동한 뒤 선거 종류 탭 클릭과 '시도' 선택까지 마칩니다 (Step 1~3).
+    반환된 페이지는 fetch_result_html()로 검색 버튼만 다시 눌러 재사용할 수 있습니다.
+    """
+    page = await context.new_page()
+    page.set_default_timeout(30_000)
+
+    print(f"Step 1: Navigating to target page: {TARGET_PAGE_URL}")
+    with span("navigate", region=city_code):
+        await page.goto(TARGET_PAGE_URL, wait_until="domcontentloaded", timeout=60_000)
+    print("Step 1: Target page navigation completed.")
+
+    print(f"Step 2: Clicking on election type tab: '{ELECTION_TYPE_SELECTOR}'")
+    try:
+        with span("tab_click", region=city_code):
+            await page.locator(ELECTION_TYPE_SELECTOR).wait_for(state="visible", timeout=15000)
+            await page.locator(ELECTION_TYPE_SELECTOR).click(timeout=10000)
+            print("Step 2: Election type tab clicked.")
             
-            if len(data_rows) < 2: # 최소 후보자명 행 + 합계 행
-                raise ValueError("Parsing Error: Not enough rows in tbody to get summary and data.")
-
-            # 합계 행은 tbody의 두 번째 tr로 가정 (첫 번째 tr은 후보자 이름용)
-            summary_tr = data_rows[1] 
-            summary_cols_td = summary_tr.find_all("td")
-            summary_row_values = [td.get_text(strip=True) for td in summary_cols_td]
-
-            if summary_row_values and summary_row_values[0] == "합계":
-                print(f"Found summary row: {summary_row_values}")
-                summary_row_data["구시군명"] = summary_row_values[0]
-                summary_row_data["선거인수"] = summary_row_values[1]
-                summary_row_data["투표수"] = summary_row_values[2]
-                # 후보자별 득표수 (합계)
-                for i, cand_name in enumerate(candidate_names):
-                    summary_row_data[cand_name] = summary_row_values[3 + i]
-                
-                summary_idx_offset = 3 + len(candidate_names)
-                if len(summary_row_values) > summary_idx_offset:
-                    summary_row_data["후보자계"] = summary_row_values[summary_idx_offset]
-                if len(summary_row_values) > summary_idx_offset + 1:
-                    summary_row_data["무효투표수"] = summary_row_values[summary_idx_offset + 1]
-                if len(summary_row_values) > summary_idx_offset + 2:
-                    summary_row_data["기권수"] = summary_row_values[summary_idx_offset + 2]
-                if len(summary_row_values) > summary_idx_offset + 3: 
-                    summary_row_data["개표율"] = summary_row_values[summary_idx_offset + 3]
-            else:
-                print("Warning: Could not parse the summary row (expected as the second row in tbody).")
-
-            # 실제 시군구 데이터는 tbody의 네 번째 tr부터 시작하며, 두 행씩 건너뛰며 숫자 데이터 행을 가져옴
-            # (첫번째 tr: 후보자명, 두번째 tr: 합계, 세번째 tr: 합계에 대한 득표율, 네번째 tr: 첫번째 시군구 데이터)
-            for tr_idx in range(3, len(data_rows), 2): # 3, 5, 7, ...
-                tr = data_rows[tr_idx]
-                cols_td = tr.find_all("td")
-                row_values_text = [td.get_text(strip=True) for td in cols_td]
-
-                if not row_values_text or not row_values_text[0] or not row_values_text[1].replace(',','').isdigit():
-                    print(f"Skipping non-data row or row with invalid 선거인수: {row_values_text}")
-                    continue
-                
-                # 컬럼 개수: 구시군명(1) + 선거인수(1) + 투표수(1) + 후보자수(N) + 후보자계(1) + 무효(1) + 기권(1) + 개표율(1) = N + 8
-                # 제공된 HTML 기준으로는 개표율까지 10개 컬럼 (후보자 3명일 때)
-                expected_min_cols = 3 + len(candidate_names) + 3 # 최소 (구시군,선거인,투표수 + 후보자N + 계,무효,기권)
-                if len(row_values_text) < expected_min_cols:
-                    print(f"Skipping sigungu row due to insufficient columns (expected at least {expected_min_cols}): {row_values_text}")
-                    continue
-
-                entry = {}
-                entry["구시군명"] = row_values_text[0]
-                entry["선거인수"] = row_values_text[1]
-                entry["투표수"] = row_values_text[2]
-                for i, cand_name in enumerate(candidate_names):
-                    entry[cand_name] = row_values_text[3 + i] 
-                
-                current_idx = 3 + len(candidate_names)
-                entry["후보자계"] = row_values_text[current_idx]
-                entry["무효투표수"] = row_values_text[current_idx + 1]
-                entry["기권수"] = row_values_text[current_idx + 2]
-                # 시군구별 개표율은 마지막 컬럼에 있을 수 있음
-                if len(row_values_text) > current_idx + 3:
-                     entry["개표율"] = row_values_text[current_idx + 3]
-
-                sigungu_data_list.append(entry)
-
-            if not sigungu_data_list:
-                raise ValueError("Parsing Error: No valid sigungu data rows processed after filtering.")
-
-            scraped_data_for_redis = {
-                "timestamp": execution_timestamp, 
-                "candidates": candidate_names, 
-                "data": sigungu_data_list,
-                "summary": summary_row_data 
-            }
-            print(f"Data prepared for Redis (timestamp: {execution_timestamp})")
-            print(f"Candidate names for Redis: {candidate_names}")
-            print(f"Number of sigungu data rows for Redis: {len(sigungu_data_list)}")
-            if sigungu_data_list: print(f"Sample sigungu data entry for Redis: {sigungu_data_list[0]}")
-            if summary_row_data: print(f"Summary row data for Redis: {summary_row_data}")
-            print("Step 7: HTML parsing completed.")
-
-        except TimeoutError as e:
-            print(f"TimeoutError occurred: {e}")
-            if page:
-                screenshot_path = os.path.join(screenshot_dir, f"error_timeout_{file_timestamp}.png")
-                try: page.screenshot(path=screenshot_path, full_page=True)
-                except Exception as se: print(f"Could not save screenshot: {se}")
-            raise 
+            print(f"Waiting for '{SIDO_DROPDOWN_SELECTOR}' and '{SEARCH_BUTTON_SELECTOR}' to be ready after election type click...")
+            await page.wait_for_selector(SIDO_DROPDOWN_SELECTOR, state="visible", timeout=15000)
+            print(f"'{SIDO_DROPDOWN_SELECTOR}' is now visible.")
+            await page.locator(SEARCH_BUTTON_SELECTOR).wait_for(state="visible", timeout=15000)
+            print(f"'{SEARCH_BUTTON_SELECTOR}' is now visible.")
+    except TimeoutError as e:
+        print(f"Timeout during Step 2 (election type click or initial element visibility): {e}")
+        await _save_screenshot(page, "error_step2_timeout", file_timestamp)
+        raise
+    except Exception as e:
+        print(f"Error during Step 2 (election type click or initial element visibility): {e}")
+        await _save_screenshot(page, "error_step2_exception", file_timestamp)
+        raise
+
+    print(f"Step 3: Selecting '시도' dropdown ({city_code}) using selector '{SIDO_DROPDOWN_SELECTOR}'...")
+    with span("sido_select", region=city_code):
+        await page.select_option(SIDO_DROPDOWN_SELECTOR, city_code) 
+    print(f"Step 3: '시도' ({city_code}) selected.")
+    return page
+
+
+async def fetch_result_html(page, file_timestamp, city_code=None):
+    """
+    이미 '시도'가 선택된 페이지에서 검색 버튼을 눌러 결과 테이블 HTML을 가져옵니다 (Step 4~6).
+    """
+    print(f"Waiting for search button '{SEARCH_BUTTON_SELECTOR}' to be ready after '시도' selection...")
+    try:
+        await page.locator(SEARCH_BUTTON_SELECTOR).wait_for(state="visible", timeout=10000) 
+        if not await page.locator(SEARCH_BUTTON_SELECTOR).is_enabled(timeout=5000):
+            print("Warning: Search button is visible but reported as not enabled shortly after Sido selection. Proceeding with click.")
+        print("Search button is confirmed to be targetable.")
+    except TimeoutError as e:
+        print(f"Timeout waiting for search button to be ready/enabled after '시도' selection: {e}")
+        await _save_screenshot(page, "error_search_button_not_ready_after_sido_timeout", file_timestamp)
+        raise
+    
+    print(f"Step 4: Clicking search button ('{SEARCH_BUTTON_SELECTOR}')...")
+    with span("search", region=city_code):
+        # 재사용하는 페이지에는 직전 tick의 테이블이 남아 있으므로 표시해 두고, 이번 검색의 응답을 받은 뒤에만 다음 단계로 넘어감
+        await page.evaluate(
+            "selector => document.querySelectorAll(selector).forEach(table => table.setAttribute('data-previous-search', ''))",
+            TABLE_SELECTOR,
+        )
+        async with page.expect_response(lambda response: REPORT_PATH in response.url, timeout=60_000):
+            await page.locator(SEARCH_BUTTON_SELECTOR).click(timeout=15000)
+    print("Step 4: Search button clicked.")
+
+    print(f"Step 5: Waiting for table ('{FRESH_TABLE_SELECTOR}') to load after search...")
+    with span("table_wait", region=city_code):
+        await page.wait_for_selector(FRESH_TABLE_SELECTOR, timeout=60_000)
+    print("Step 5: Result table loaded.")
+
+    print(f"Step 6: Extracting HTML from '{FRESH_TABLE_SELECTOR}'...")
+    with span("html_extract", region=city_code):
+        html = await page.inner_html(FRESH_TABLE_SELECTOR)
+    set_gauge("html_bytes", len(html.encode("utf-8")), region=city_code)
+    print("Step 6: HTML extraction completed.")
+    return html
+
+
+def parse_and_measure(html, execution_timestamp, city_code):
+    """Step 7 파싱을 시간 측정과 행 수 기록과 함께 수행합니다. 녹화가 켜져 있으면 HTML도 남깁니다."""
+    maybe_record(city_code, execution_timestamp, html)
+    with span("parse", region=city_code):
+        scraped_data = parse_result_html(html, execution_timestamp)
+    set_gauge("rows", len(scraped_data["data"]), region=city_code)
+    return scraped_data
+
+
+def scrape_via_http(execution_timestamp, city_code=DEFAULT_CITY_CODE, base_url=None):
+    """
+    브라우저 없이 결과 테이블을 직접 요청해 파싱합니다.
+    파싱 가능한 테이블을 얻지 못하면 None을 반환하며, 이 경우 Playwright 경로를 사용합니다.
+    base_url을 넘기면 NEC_BASE_URL 대신 그 주소로 요청합니다 (replay_harness.py의 스텁 등).
+    """
+    print(f"Step 1-6 (HTTP): Requesting result table directly for cityCode {city_code}...")
+    with span("http_fetch", region=city_code):
+        html = fetch_table_html(city_code, base_url=base_url)
+    if html is None:
+        print(f"Step 1-6 (HTTP): No usable table in response for cityCode {city_code}, falling back to Playwright.")
+        return None
+    set_gauge("html_bytes", len(html.encode("utf-8")), region=city_code)
+    try:
+        return parse_and_measure(html, execution_timestamp, city_code)
+    except ValueError as e:
+        print(f"Step 7 (HTTP): Could not parse HTTP response for cityCode {city_code}, falling back to Playwright: {e}")
+        return None
+
+
+def scrape_regions_via_http(city_codes, execution_timestamp, max_workers=None, base_url=None):
+    """
+    여러 '시도'를 HTTP로 동시에 요청합니다. 성공한 지역만 {코드: 데이터}로 반환합니다.
+    요청은 가벼우므로 기본적으로 모든 지역을 한 번에 보내 가장 느린 지역만큼만 걸리게 합니다 (max_workers로 제한 가능).
+    """
+    def scrape_one(city_code):
+        try:
+            return scrape_via_http(execution_timestamp, city_code, base_url)
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            if page:
-                screenshot_path = os.path.join(screenshot_dir, f"error_unexpected_{file_timestamp}.png")
-                try: page.screenshot(path=screenshot_path, full_page=True)
-                except Exception as se: print(f"Could not save screenshot: {se}")
+            print(f"HTTP scrape for cityCode {city_code} raised unexpectedly: {e}")
+            return None
+
+    regions = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers or len(city_codes), len(city_codes)))) as pool:
+        for city_code, data in zip(city_codes, pool.map(scrape_one, city_codes)):
+            if data:
+                regions[city_code] = data
+    return regions
+
+
+async def _scrape_region_in_new_context(browser, semaphore, city_code, execution_timestamp, file_timestamp, resource_policy=None):
+    """
+    공유 브라우저에 컨텍스트를 하나 만들어 한 '시도'의 Step 1~7을 수행합니다.
+    watch 모드와 같은 open_result_page()/fetch_result_html()을 사용합니다.
+    """
+    async with semaphore:
+        print(f"[{city_code}] Opening browser context...")
+        context = await browser.new_context(**BROWSER_CONTEXT_OPTIONS)
+        try:
+            if resource_policy:
+                await resource_policy.install_async(context)
+            page = await open_result_page(context, file_timestamp, city_code)
+            html = await fetch_result_html(page, file_timestamp, city_code)
+            print(f"[{city_code}] Result table extracted.")
+        except Exception as e:
+            print(f"[{city_code}] Browser scrape failed: {e}")
+            await _save_screenshot(context.pages[-1] if context.pages else None, f"error_region_{city_code}", file_timestamp)
             raise
         finally:
-            if browser:
-                print("Closing browser...")
-                browser.close()
-                print("Browser closed.")
+            await context.close()
+    return parse_and_measure(html, execution_timestamp, city_code)
+
 
-    if scraped_data_for_redis:
-        print(f"Step 8: Attempting to push RAW data to Upstash Redis with key '{RAW_DATA_REDIS_KEY}'...")
+async def scrape_regions_with_browser(city_codes, execution_timestamp, file_timestamp, max_concurrency=DEFAULT_MAX_CONCURRENCY, resource_policy=None):
+    """
+    브라우저 하나를 띄우고 최대 max_concurrency개의 컨텍스트로 여러 '시도'를 동시에 수집합니다.
+    반환값: ({코드: 데이터}, {코드: 오류 메시지}) - 한 지역의 실패는 다른 지역에 영향을 주지 않습니다.
+    """
+    regions, failed_regions = {}, {}
+    async with async_playwright() as p:
+        print("Launching browser...")
+        browser = await p.chromium.launch(headless=True)
         try:
-            push_to_upstash_redis(
-                scraped_data_for_redis, 
-                UPSTASH_REDIS_ENDPOINT, 
-                UPSTASH_REDIS_PORT, 
-                UPSTASH_REDIS_PASSWORD,
-                RAW_DATA_REDIS_KEY
+            semaphore = asyncio.Semaphore(max_concurrency)
+            outcomes = await asyncio.gather(
+                *(_scrape_region_in_new_context(browser, semaphore, code, execution_timestamp, file_timestamp, resource_policy) for code in city_codes),
+                return_exceptions=True,
             )
-            print("Step 8: RAW data push to Upstash Redis finished.")
+        finally:
+            print("Closing browser...")
+            await browser.close()
+            print("Browser closed.")
+
+    for city_code, outcome in zip(city_codes, outcomes):
+        if isinstance(outcome, BaseException):
+            failed_regions[city_code] = str(outcome)
+        else:
+            regions[city_code] = outcome
+    return regions, failed_regions
+
+
+def build_region_snapshot(execution_timestamp, city_codes, regions, failed_regions):
+    """지역별 수집 결과를 하나의 스냅샷으로 합칩니다. 지역 순서는 city_codes를 따릅니다."""
+    return {
+        "timestamp": execution_timestamp,
+        "regions": {code: regions[code] for code in city_codes if code in regions},
+        "failed_regions": failed_regions,
+    }
+
+
+def _previous_regions(city_codes, last_regions, redis_settings):
+    """
+    지역별 마지막 정상 수집 데이터. last_regions(메모리 캐시)에 없으면 Redis의 지역별 원본 키에서 읽고
+    열 단위 "table"을 다시 만듭니다. 둘 다 없으면 빠집니다.
+    """
+    found = {code: last_regions[code] for code in city_codes if last_regions and code in last_regions}
+    missing = [code for code in city_codes if code not in found]
+    if missing:
+        stored = get_json_from_upstash_redis(RAW_DATA_BY_REGION_REDIS_KEY, *redis_settings) or {}
+        for code in missing:
+            region_data = (stored.get("regions") or {}).get(code)
+            if region_data and region_data.get("data"):
+                candidates = region_data.get("candidates") or []
+                table = table_from_entries(candidates, region_data.get("summary"), region_data["data"])
+                found[code] = dict(region_data, table=table)
+    return found
+
+
+def carry_forward_failed_regions(region_snapshot, redis_settings, last_regions=None):
+    """
+    failed_regions에 있는 지역은 직전에 저장한 데이터를 "stale": True로 표시해 스냅샷에 그대로 싣습니다.
+    한 지역의 수집 실패가 지역별 키와 이력에서 그 지역을 지우지 않도록 합니다. 실어 온 지역 코드 목록을 반환합니다.
+    """
+    regions = region_snapshot["regions"]
+    failed_codes = [code for code in region_snapshot.get("failed_regions") or {} if code not in regions]
+    if not failed_codes:
+        return []
+    carried = _previous_regions(failed_codes, last_regions, redis_settings)
+    for code, region_data in carried.items():
+        regions[code] = dict(region_data, stale=True)
+    if carried:
+        print(f"Step 8: Carrying forward last good data for failed region(s): {', '.join(carried)}")
+    return list(carried)
+
+
+def publish_results(region_snapshot, redis_settings, change_state=None, accumulators=None, last_regions=None):
+    """
+    지역별 최종 결과를 계산한 뒤, 원본과 계산 결과를 하나의 Redis 트랜잭션으로 저장합니다 (Step 8~9).
+    기본 지역(부산)은 기존 키(live_election_data, live_election_data_projected_final)에도 그대로 저장합니다.
+    change_state는 직전 저장 시점의 변경 감지 상태이며, None이면 Redis에서 읽어옵니다.
+    내용이 직전과 같으면 계산과 저장을 건너뜁니다. 갱신된 변경 감지 상태를 반환합니다.
+    accumulators({지역코드: ProjectionAccumulator})를 넘기면 바뀐 구시군 행만 다시 계산합니다.
+    실패한 지역은 직전 데이터를 stale로 표시해 함께 저장합니다. last_regions({지역코드: 데이터})를 넘기면
+    그 캐시에서 직전 데이터를 찾고(없으면 Redis에서 읽음), 이번에 수집한 지역으로 캐시를 갱신합니다.
+    """
+    endpoint, port, password = redis_settings
+    regions = region_snapshot.get("regions") if region_snapshot else None
+    if not regions:
+        print("Skipping Upstash Redis push and calculation: No data was scraped.")
+        return change_state
 
-            print("Step 9: Calculating final results...")
-            calculated_results = calculate_final_results(scraped_data_for_redis)
+    try:
+        if last_regions is not None:
+            last_regions.update(regions)
+        carried_codes = carry_forward_failed_regions(region_snapshot, redis_settings, last_regions)
+        if change_state is None:
+            change_state = get_json_from_upstash_redis(CHANGE_STATE_REDIS_KEY, endpoint, port, password)
+        with span("change_detect"):
+            new_change_state, delta = detect_changes(change_state, regions)
+        if delta is None:
+            print(f"Step 8: Snapshot unchanged since version {new_change_state.get('version')}, skipping calculation and Redis push.")
+            return new_change_state
+        changed_rows = sum(len(region_delta["changed"]) for region_delta in delta["regions"].values())
+        print(f"Step 8: Snapshot changed (version {delta['version']}, {len(delta['regions'])} region(s), {changed_rows} row(s)).")
+        region_snapshot["version"] = delta["version"]
+        region_snapshot["fingerprints"] = new_change_state["fingerprints"]
+        delta["timestamp"] = region_snapshot.get("timestamp")
+
+        print("Step 8: Calculating final results...")
+        projected_by_region = {}
+        for city_code, scraped_data in regions.items():
+            with span("projection", region=city_code):
+                if accumulators is None:
+                    calculated_results = calculate_final_results(scraped_data)
+                else:
+                    accumulator = accumulators.setdefault(city_code, ProjectionAccumulator())
+                    calculated_results = calculate_final_results_incremental(scraped_data, accumulator, delta["regions"].get(city_code, {}))
             if calculated_results and "error" not in calculated_results :
-                print(f"Step 9.5: Attempting to push FINAL calculated data to Upstash Redis with key '{PROJECTED_DATA_REDIS_KEY}'...")
-                push_to_upstash_redis(
-                    calculated_results,
-                    UPSTASH_REDIS_ENDPOINT,
-                    UPSTASH_REDIS_PORT,
-                    UPSTASH_REDIS_PASSWORD,
-                    PROJECTED_DATA_REDIS_KEY
-                )
-                print("Step 9.5: FINAL calculated data push to Upstash Redis finished.")
+                projected_by_region[city_code] = dict(calculated_results, stale=True) if city_code in carried_codes else calculated_results
             else:
                 error_msg = calculated_results.get('error', 'Unknown calculation error') if isinstance(calculated_results, dict) else "Calculation function returned None or unexpected type"
-                print(f"Step 9: Could not calculate final results or an error occurred: {error_msg}")
+                print(f"Step 8: Could not calculate final results for cityCode {city_code} or an error occurred: {error_msg}")
+
+        legacy_snapshot = dict(region_snapshot, regions={code: legacy_region(data) for code, data in regions.items()})
+        items = {
+            WIRE_DATA_REDIS_KEY: encode_wire(build_wire_snapshot(region_snapshot, projected_by_region), WIRE_FORMAT_CODEC),
+            RAW_DATA_BY_REGION_REDIS_KEY: legacy_snapshot,
+            DELTA_REDIS_KEY: delta,
+            CHANGE_STATE_REDIS_KEY: new_change_state,
+        }
+        if projected_by_region:
+            items[PROJECTED_DATA_BY_REGION_REDIS_KEY] = {"timestamp": region_snapshot.get("timestamp"), "regions": projected_by_region}
+        if DEFAULT_CITY_CODE in regions:
+            items[RAW_DATA_REDIS_KEY] = legacy_region(regions[DEFAULT_CITY_CODE])
+            items[PROJECTED_DATA_REDIS_KEY] = projected_by_region.get(DEFAULT_CITY_CODE)
+
+        entry_id, stale_ids, history_fields = plan_history_append(change_state, delta["version"])
+        new_change_state.update(history_fields)
+        stream_entries = [(HISTORY_STREAM_KEY, encode_history_snapshot(region_snapshot), HISTORY_MAXLEN, entry_id)]
+        stream_deletes = [(HISTORY_STREAM_KEY, stale_id) for stale_id in stale_ids]
+
+        print(f"Step 9: Attempting to push RAW and FINAL calculated data for {len(regions)} region(s) to Upstash Redis...")
+        notifications = [(NOTIFY_CHANNEL, build_notification(delta, projected_by_region))]
+        with span("redis_push"):
+            push_many_to_upstash_redis(
+                items, endpoint, port, password, stream_entries=stream_entries, stream_deletes=stream_deletes, notifications=notifications
+            )
+        print("Step 9: Data push to Upstash Redis finished.")
+        return new_change_state
+    except Exception as e:
+        print(f"Error during data push or calculation: {e}")
+        if accumulators is not None:
+            # 저장에 실패하면 다음 delta의 기준이 어긋나므로 누적 상태를 버리고 다음에 처음부터 계산
+            accumulators.clear()
+        raise
+
+
+def crawl_once(use_http=True, city_codes=None, max_concurrency=DEFAULT_MAX_CONCURRENCY, block_resources=False):
+    redis_settings = get_redis_settings()
+    city_codes = city_codes or [DEFAULT_CITY_CODE]
+    resource_policy = build_resource_policy(block_resources)
+
+    os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+    current_utc_time = datetime.datetime.now(datetime.timezone.utc)
+    execution_timestamp = current_utc_time.isoformat() 
+    file_timestamp = current_utc_time.strftime("%Y%m%d-%H%M%S")
+
+    print(f"Starting crawl at {execution_timestamp} for region(s): {', '.join(city_codes)}")
+    started = time.perf_counter()
+    try:
+        regions = scrape_regions_via_http(city_codes, execution_timestamp) if use_http else {}
+        failed_regions = {}
+        remaining_codes = [code for code in city_codes if code not in regions]
+        if remaining_codes:
+            print(f"Scraping {len(remaining_codes)} region(s) with Playwright: {', '.join(remaining_codes)}")
+            browser_regions, failed_regions = asyncio.run(
+                scrape_regions_with_browser(remaining_codes, execution_timestamp, file_timestamp, max_concurrency, resource_policy)
+            )
+            regions.update(browser_regions)
+        print(f"Scraped {len(regions)}/{len(city_codes)} region(s) in {time.perf_counter() - started:.2f}s")
+        set_gauge("regions_failed", len(failed_regions))
+
+        if failed_regions:
+            print(f"Warning: Failed region(s): {failed_regions}")
+        if not regions:
+            raise RuntimeError(f"All regions failed to scrape: {failed_regions}")
+
+        publish_results(build_region_snapshot(execution_timestamp, city_codes, regions, failed_regions), redis_settings)
+    finally:
+        if resource_policy:
+            resource_policy.report()
+        metrics.flush(mode="once")
+
+
+# --- 상시 실행(watch) 모드 ---
+class WarmBrowserSession:
+    """
+    브라우저, 컨텍스트, '시도'까지 선택된 지역별 결과 페이지를 열어둔 채로 재사용합니다.
+    매 tick에서는 검색 버튼 클릭과 테이블 추출만 다시 수행합니다.
+    """
+
+    def __init__(self, playwright, resource_policy=None):
+        self.playwright = playwright
+        self.resource_policy = resource_policy
+        self.browser = None
+        self.context = None
+        self.pages = {}
+        self.generation = 0 # 브라우저를 새로 띄울 때마다 증가
+        self._relaunch_lock = asyncio.Lock()
+
+    async def cold_start(self):
+        """브라우저를 (재)실행합니다. 열려 있던 페이지는 모두 버려집니다."""
+        await self.close()
+        started = time.perf_counter()
+        self.browser, self.context = await launch_browser(self.playwright, self.resource_policy)
+        self.generation += 1
+        print(f"[watch] Cold start took {time.perf_counter() - started:.2f}s")
+
+    async def relaunch(self, generation):
+        """
+        generation 세대의 브라우저가 아직 떠 있으면 다시 띄웁니다.
+        여러 지역이 동시에 실패해도 브라우저는 한 번만 다시 실행됩니다.
+        """
+        async with self._relaunch_lock:
+            if self.generation == generation or not self.browser:
+                await self.cold_start()
+
+    async def discard_page(self, city_code):
+        stale_page = self.pages.pop(city_code, None)
+        if stale_page:
+            try: await stale_page.close()
+            except Exception as e: print(f"[watch] Could not close stale page: {e}")
+
+    async def open_page(self, city_code, file_timestamp):
+        """기존 브라우저는 유지한 채 해당 지역의 결과 페이지만 새로 만듭니다."""
+        await self.discard_page(city_code)
+        if not self.browser:
+            await self.relaunch(self.generation)
+        started = time.perf_counter()
+        self.pages[city_code] = await open_result_page(self.context, file_timestamp, city_code)
+        print(f"[watch] Page open for cityCode {city_code} took {time.perf_counter() - started:.2f}s")
+        return self.pages[city_code]
+
+    async def fetch_html(self, city_code, file_timestamp):
+        """
+        열어둔 페이지에서 테이블 HTML을 가져옵니다.
+        셀렉터 타임아웃이든 닫히거나 죽은 페이지든 실패하면 페이지를 새로 열고, 그래도 실패하면 브라우저를 다시 띄웁니다.
+        실패한 페이지는 pages에서 빠지므로 다음 tick에 다시 만들어집니다.
+        """
+        generation = self.generation
+        page = self.pages.get(city_code)
+        if page is not None:
+            try:
+                # 검색 후 페이지가 다시 그려지므로 '시도' 선택을 한 번 더 확인
+                await page.select_option(SIDO_DROPDOWN_SELECTOR, city_code, timeout=10000)
+                return await fetch_result_html(page, file_timestamp, city_code)
+            except Exception as e:
+                print(f"[watch] Warm page for cityCode {city_code} failed, recreating page: {e}")
+                await _save_screenshot(page, f"error_watch_tick_{city_code}", file_timestamp)
+            incr("retries", kind="page_recreate", region=city_code)
+        try:
+            return await fetch_result_html(await self.open_page(city_code, file_timestamp), file_timestamp, city_code)
         except Exception as e:
-            print(f"Error during data push or calculation: {e}")
+            print(f"[watch] Page open for cityCode {city_code} failed, relaunching browser: {e}")
+            await self.discard_page(city_code)
+        incr("retries", kind="browser_relaunch", region=city_code)
+        await self.relaunch(generation)
+        try:
+            return await fetch_result_html(await self.open_page(city_code, file_timestamp), file_timestamp, city_code)
+        except Exception:
+            await self.discard_page(city_code)
             raise
-    else:
-        print("Skipping Upstash Redis push and calculation: No data was scraped.")
+
+    async def fetch_regions(self, city_codes, execution_timestamp, file_timestamp, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """
+        열어둔 페이지로 여러 '시도'를 최대 max_concurrency개씩 동시에 수집합니다 (scrape_regions_with_browser와 같은 방식).
+        반환값: ({코드: 데이터}, {코드: 오류 메시지}) - 한 지역의 실패는 다른 지역에 영향을 주지 않습니다.
+        """
+        if not self.browser:
+            await self.relaunch(self.generation)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_one(city_code):
+            async with semaphore:
+                html = await self.fetch_html(city_code, file_timestamp)
+            return parse_and_measure(html, execution_timestamp, city_code)
+
+        outcomes = await asyncio.gather(*(fetch_one(code) for code in city_codes), return_exceptions=True)
+        regions, failed_regions = {}, {}
+        for city_code, outcome in zip(city_codes, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"[watch] cityCode {city_code} failed: {outcome}")
+                failed_regions[city_code] = str(outcome)
+            else:
+                regions[city_code] = outcome
+        return regions, failed_regions
+
+    async def close(self):
+        if self.browser:
+            print("Closing browser...")
+            try: await self.browser.close()
+            except Exception as e: print(f"[watch] Error while closing browser: {e}")
+            print("Browser closed.")
+        self.browser = None
+        self.context = None
+        self.pages = {}
+
+
+def watch(interval_seconds, use_http=True, city_codes=None, max_concurrency=DEFAULT_MAX_CONCURRENCY, block_resources=False, scheduler=None):
+    """
+    브라우저를 계속 띄워둔 채 interval_seconds 간격으로 크롤링과 Redis 저장을 반복합니다.
+    use_http가 켜져 있으면 HTTP 직접 요청을 먼저 시도하고, 실패한 지역만 브라우저로 동시에 수집합니다.
+    한 tick이 실패해도 다음 tick에서 스스로 복구를 시도합니다.
+    scheduler(AdaptivePollScheduler)를 넘기면 고정 간격 대신 개표 진행 속도에 맞춰 간격을 정하고,
+    모든 지역 개표율이 100%가 되면 종료합니다.
+    """
+    try:
+        asyncio.run(_watch_loop(interval_seconds, use_http, city_codes, max_concurrency, block_resources, scheduler))
+    except KeyboardInterrupt:
+        print("[watch] Interrupted, shutting down.")
+
+
+async def _watch_loop(interval_seconds, use_http, city_codes, max_concurrency, block_resources, scheduler):
+    redis_settings = get_redis_settings()
+    city_codes = city_codes or [DEFAULT_CITY_CODE]
+    os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+
+    async with async_playwright() as p:
+        session = WarmBrowserSession(p, build_resource_policy(block_resources))
+        change_state = None # 첫 tick에서 Redis에 저장된 상태를 읽어오고 이후에는 메모리에 유지
+        accumulators = {} # 지역별 추정 누적 상태
+        last_regions = {} # 지역별 마지막 정상 수집 데이터 (실패한 지역을 채울 때 사용)
+        try:
+            while True:
+                tick_started = time.perf_counter()
+                current_utc_time = datetime.datetime.now(datetime.timezone.utc)
+                execution_timestamp = current_utc_time.isoformat()
+                file_timestamp = current_utc_time.strftime("%Y%m%d-%H%M%S")
+                print(f"[watch] Starting tick at {execution_timestamp}")
+                label = None
+                try:
+                    now = time.monotonic()
+                    due_codes = scheduler.due_regions(city_codes, now) if scheduler else city_codes
+                    backing_off = {code: "backing off after repeated failures" for code in city_codes if code not in due_codes}
+                    set_gauge("regions_backing_off", len(backing_off))
+                    if not due_codes:
+                        label = "Backoff"
+                        print("[watch] Every region is backing off after repeated failures, skipping this tick.")
+                    else:
+                        regions = scrape_regions_via_http(due_codes, execution_timestamp) if use_http else {}
+                        failed_regions = {}
+                        remaining_codes = [code for code in due_codes if code not in regions]
+                        if not remaining_codes:
+                            label = "HTTP"
+                        else:
+                            label = "Warm" if all(code in session.pages for code in remaining_codes) else "Cold"
+                            browser_regions, failed_regions = await session.fetch_regions(remaining_codes, execution_timestamp, file_timestamp, max_concurrency)
+                            regions.update(browser_regions)
+                        fetch_elapsed = time.perf_counter() - tick_started
+                        if scheduler:
+                            scheduler.record_regions(regions, failed_regions, now)
+                        set_gauge("regions_failed", len(failed_regions))
+                        if not regions:
+                            raise RuntimeError(f"All regions failed to scrape: {failed_regions}")
+                        previous_change_state = change_state
+                        change_state = publish_results(
+                            build_region_snapshot(execution_timestamp, city_codes, regions, {**backing_off, **failed_regions}),
+                            redis_settings, change_state, accumulators, last_regions,
+                        )
+                        if scheduler:
+                            scheduler.record_success(region_turnouts(regions), count_changed_rows(previous_change_state, change_state), time.monotonic())
+                        print(f"[watch] {label} tick took {time.perf_counter() - tick_started:.2f}s (fetch {fetch_elapsed:.2f}s)")
+                except Exception as e:
+                    # 브라우저 쪽 실패는 지역별로 fetch_html()이 이미 복구를 시도했으므로 여기서는 세션을 건드리지 않음.
+                    # Redis 저장, 변경 감지, 계산 실패 때문에 열어둔 브라우저를 버리면 매 tick이 콜드 스타트가 됨
+                    print(f"[watch] Tick failed: {e}")
+                    incr("tick_failures")
+                    if scheduler:
+                        scheduler.record_failure()
+                if session.resource_policy:
+                    session.resource_policy.report()
+                metrics.flush(mode="watch", tick=label)
+
+                if scheduler and scheduler.all_counted(city_codes):
+                    print("[watch] All regions report 100% counted, stopping.")
+                    break
+                delay = scheduler.next_delay() if scheduler else interval_seconds
+                set_gauge("poll_interval_seconds", round(delay, 3))
+                sleep_for = max(0.0, delay - (time.perf_counter() - tick_started))
+                backoff_remaining = scheduler.backoff_remaining(city_codes, time.monotonic()) if scheduler else None
+                if backoff_remaining is not None and backoff_remaining < sleep_for:
+                    # 기본 간격(최대 간격까지 늘어났을 수 있음) 대신 가장 먼저 백오프가 끝나는 지역에 맞춰 깨어남
+                    print(f"[watch] Every region is backing off, waking in {backoff_remaining:.1f}s when the first one is due.")
+                    sleep_for = backoff_remaining
+                await asyncio.sleep(sleep_for)
+        finally:
+            await session.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="NEC 개표 결과를 수집해 Upstash Redis에 저장합니다.")
+    parser.add_argument("--watch", action="store_true", help="브라우저를 띄워둔 채 주기적으로 반복 실행합니다.")
+    parser.add_argument("--interval", type=float, default=60.0, help="--watch 모드의 실행 간격(초). 기본값 60초.")
+    parser.add_argument("--adaptive", action="store_true", help="--watch 모드에서 개표율 변화 속도에 맞춰 간격을 조절하고, 개표가 끝나면 종료합니다.")
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL_SECONDS, help="--adaptive 최소 간격(초).")
+    parser.add_argument("--max-interval", type=float, default=DEFAULT_MAX_INTERVAL_SECONDS, help="--adaptive 최대 간격(초).")
+    parser.add_argument("--jitter", type=float, default=DEFAULT_JITTER, help="--adaptive 간격에 더할 무작위 비율 (0.1 = ±10%%).")
+    parser.add_argument("--regions", default=None, help="수집할 '시도' 코드 (쉼표 구분 또는 'all'). 기본값은 NEC_REGION_CODES 환경 변수, 없으면 부산(2600).")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY, help="브라우저로 동시에 수집할 최대 지역 수 (HTTP 요청은 모든 지역을 한 번에 보냄).")
+    parser.add_argument("--browser-only", action="store_true", help="HTTP 직접 요청을 건너뛰고 항상 Playwright로 수집합니다.")
+    parser.add_argument("--record", metavar="DIR", default=None, help="수집한 결과 테이블 HTML을 DIR/<지역코드>/<시각>.html로 저장합니다 (NEC_RECORD_DIR).")
+    parser.add_argument("--block-resources", action="store_true", help="브라우저에서 이미지/스타일/폰트 요청을 끊고 NEC 스크립트는 로컬 캐시로 응답합니다 (NEC_BLOCK_RESOURCES).")
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
+    args = parse_args()
+    city_codes = parse_region_codes(args.regions)
+    if args.record:
+        set_record_dir(args.record)
     script_start_time = time.strftime("%Y%m%d-%H%M%S")
-    print(f"Starting crawl_once function at {script_start_time}...")
-    crawl_once()
-    print(f"crawl_once function finished at {time.strftime('%Y%m%d-%H%M%S')}.")
-
+    if args.watch:
+        scheduler = AdaptivePollScheduler(args.min_interval, args.max_interval, args.jitter) if args.adaptive else None
+        if scheduler:
+            print(f"Starting adaptive watch mode (interval {args.min_interval}-{args.max_interval}s) at {script_start_time}...")
+        else:
+            print(f"Starting watch mode (interval {args.interval}s) at {script_start_time}...")
+        watch(
+            args.interval, use_http=not args.browser_only, city_codes=city_codes, max_concurrency=args.concurrency,
+            block_resources=args.block_resources, scheduler=scheduler,
+        )
+    else:
+        print(f"Starting crawl_once function at {script_start_time}...")
+        crawl_once(use_http=not args.browser_only, city_codes=city_codes, max_concurrency=args.concurrency, block_resources=args.block_resources)
+        print(f"crawl_once function finished at {time.strftime('%Y%m%d-%H%M%S')}.")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# scripts/ 아래 모듈을 패키지 없이 그대로 import 하므로 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
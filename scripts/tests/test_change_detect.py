@@ -0,0 +1,58 @@
+from change_detect import count_changed_rows, detect_changes, empty_state
+
+
+def _region(rows, candidates=("가", "나"), summary=None):
+    return {
+        "candidates": list(candidates),
+        "data": [dict(zip(["구시군명", *candidates], row)) for row in rows],
+        "summary": summary or {"구시군명": "합계"},
+    }
+
+
+def test_first_snapshot_is_a_full_delta():
+    state, delta = detect_changes(None, {"2600": _region([("중구", "10", "20"), ("서구", "30", "40")])})
+    assert state["version"] == 1
+    assert delta["base_version"] == 0
+    assert delta["regions"]["2600"]["full"] is True
+    assert list(delta["regions"]["2600"]["changed"]) == ["중구", "서구"]
+
+
+def test_unchanged_snapshot_returns_previous_state_without_delta():
+    regions = {"2600": _region([("중구", "10", "20")])}
+    state, _ = detect_changes(None, regions)
+    same_state, delta = detect_changes(state, {"2600": _region([("중구", "10", "20")])})
+    assert delta is None
+    assert same_state is state
+
+
+def test_only_changed_and_removed_rows_are_reported():
+    state, _ = detect_changes(None, {"2600": _region([("중구", "10", "20"), ("서구", "30", "40"), ("동구", "1", "2")])})
+    new_state, delta = detect_changes(state, {"2600": _region([("중구", "10", "20"), ("서구", "31", "40")])})
+    region_delta = delta["regions"]["2600"]
+    assert "full" not in region_delta
+    assert list(region_delta["changed"]) == ["서구"]
+    assert region_delta["removed"] == ["동구"]
+    assert (delta["base_version"], delta["version"]) == (1, 2)
+    assert count_changed_rows(state, new_state) == 2
+
+
+def test_candidate_change_forces_full_delta():
+    state, _ = detect_changes(None, {"2600": _region([("중구", "10", "20")])})
+    _, delta = detect_changes(state, {"2600": _region([("중구", "10", "20", "5")], candidates=("가", "나", "다"))})
+    assert delta["regions"]["2600"]["full"] is True
+    assert delta["regions"]["2600"]["candidates"] == ["가", "나", "다"]
+
+
+def test_regions_missing_from_a_tick_keep_their_fingerprints():
+    state, _ = detect_changes(None, {"2600": _region([("중구", "10", "20")]), "1100": _region([("종로구", "5", "6")])})
+    new_state, delta = detect_changes(state, {"2600": _region([("중구", "11", "20")])})
+    assert list(delta["regions"]) == ["2600"]
+    assert new_state["fingerprints"]["1100"] == state["fingerprints"]["1100"]
+    assert count_changed_rows(state, new_state) == 1
+
+
+def test_count_changed_rows_from_empty_state():
+    state, _ = detect_changes(None, {"2600": _region([("중구", "10", "20"), ("서구", "30", "40")])})
+    assert count_changed_rows(None, state) == 2
+    assert count_changed_rows(state, state) == 0
+    assert count_changed_rows(empty_state(), empty_state()) == 0
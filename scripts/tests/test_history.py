@@ -0,0 +1,54 @@
+import json
+import os
+import zlib
+
+import fakeredis
+import pytest
+
+from history import HISTORY_STREAM_KEY, candidate_series, decode_entry, encode_snapshot, sigungu_series
+from nec_parser import parse_result_html
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "vccp09_2600.html")
+
+
+@pytest.fixture(scope="module")
+def parsed():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return parse_result_html(f.read(), "2026-06-03T12:00:00+00:00")
+
+
+def _snapshot(regions, version=1, timestamp="2026-06-03T12:00:00+00:00"):
+    return {"timestamp": timestamp, "version": version, "regions": regions}
+
+
+def test_payload_is_the_parsed_table(parsed):
+    entry = decode_entry(encode_snapshot(_snapshot({"2600": parsed, "1100": dict(parsed, stale=True)})))
+    assert entry["version"] == 1
+    assert entry["regions"]["2600"] == parsed["table"]
+    assert entry["regions"]["1100"] == dict(parsed["table"], stale=True)
+
+
+def test_v1_entries_decode_to_table_form():
+    payload = {"v": 1, "regions": {"2600": {
+        "candidates": ["가", "나"], "rows": ["중구"],
+        "columns": ["선거인수", "투표수", "무효투표수", "가", "나"], "values": [[100, 60, 2, 30, 28]],
+    }}}
+    region = decode_entry({"ts": "t", "version": "3", "payload": zlib.compress(json.dumps(payload).encode())})["regions"]["2600"]
+    assert (region["eligible"], region["cast"], region["invalid"], region["votes"]) == ([100], [60], [2], [[30, 28]])
+    assert region["turnout"] == [None]
+
+
+def test_series_queries_read_table_columns(parsed):
+    client = fakeredis.FakeRedis()
+    table = parsed["table"]
+    candidate, sigungu = table["candidates"][0], table["rows"][0]
+    client.xadd(HISTORY_STREAM_KEY, encode_snapshot(_snapshot({"2600": parsed})), id="1000-1")
+
+    total = sum(votes[0] for votes in table["votes"])
+    assert candidate_series(client, "2600", candidate) == [("2026-06-03T12:00:00+00:00", total)]
+    assert candidate_series(client, "2600", candidate, sigungu) == [("2026-06-03T12:00:00+00:00", table["votes"][0][0])]
+    assert candidate_series(client, "2600", "없는후보") == []
+
+    (_, values), = sigungu_series(client, "2600", sigungu)
+    assert values["eligible"] == table["eligible"][0]
+    assert values["votes"] == dict(zip(table["candidates"], table["votes"][0]))
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+import requests
+
+from nec_http import REPORT_PATH, extract_table_inner_html, fetch_table_html
+from nec_parser import parse_result_html
+from replay_harness import start_stub_server
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "vccp09_2600.html")
+
+
+def _document(table_html, prolog='<?xml version="1.0" encoding="UTF-8"?>'):
+    return (
+        f'{prolog}<!DOCTYPE html><html><head><meta charset="euc-kr"><title>개표</title></head>'
+        f'<body><table id="other"><tr><td>x</td></tr></table><table id="table01" class="table01">{table_html}</table></body></html>'
+    )
+
+
+def test_extracts_result_table_inner_html():
+    html = extract_table_inner_html(_document("<tbody><tr><td>후보가 &amp; 1</td></tr></tbody>"))
+    assert html == "<tbody><tr><td>후보가 &amp; 1</td></tr></tbody>"
+
+
+def test_extracted_fixture_parses_like_the_page_table():
+    with open(FIXTURE, encoding="utf-8") as f:
+        inner_html = f.read()
+    expected = parse_result_html(inner_html, "2026-01-01T00:00:00+00:00")
+    extracted = extract_table_inner_html(_document(inner_html, prolog=""))
+    assert parse_result_html(extracted, "2026-01-01T00:00:00+00:00") == expected
+
+
+def test_missing_table_returns_none():
+    assert extract_table_inner_html("<html><body><p>점검 중</p></body></html>") is None
+    assert extract_table_inner_html("") is None
+
+
+class _DocumentStore:
+    """start_stub_server가 쓰는 녹화 저장소 대신 시도 코드별 고정 문서를 응답합니다."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.requested = []
+
+    def document_at(self, city_code, now):
+        self.requested.append(city_code)
+        return self.documents.get(city_code)
+
+
+class _FixedClock:
+    def now(self):
+        return 0.0
+
+
+@pytest.fixture
+def stub_server():
+    with open(FIXTURE, encoding="utf-8") as f:
+        inner_html = f.read()
+    store = _DocumentStore({
+        "2600": _document(inner_html).encode("utf-8"),
+        "2700": "<html><body><p>점검 중</p></body></html>".encode("utf-8"),
+    })
+    server = start_stub_server(store, _FixedClock(), REPORT_PATH)
+    try:
+        yield f"http://{server.server_address[0]}:{server.server_address[1]}", store, inner_html
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_returns_table_from_stub(stub_server):
+    base_url, store, inner_html = stub_server
+    with requests.Session() as session:
+        html = fetch_table_html("2600", base_url=base_url, session=session)
+    assert store.requested == ["2600"]
+    assert parse_result_html(html, "2026-01-01T00:00:00+00:00") == parse_result_html(inner_html, "2026-01-01T00:00:00+00:00")
+
+
+def test_fetch_returns_none_on_http_error(stub_server):
+    base_url, store, _ = stub_server
+    with requests.Session() as session:
+        assert fetch_table_html("1100", base_url=base_url, session=session) is None
+    assert store.requested == ["1100"]
+
+
+def test_fetch_returns_none_without_result_table(stub_server):
+    base_url, store, _ = stub_server
+    with requests.Session() as session:
+        assert fetch_table_html("2700", base_url=base_url, session=session) is None
+    assert store.requested == ["2700"]
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from bench_parser import BENCH_TIMESTAMP, FIXTURE_DIR, parse_result_html_bs4, scale_fixture
+from nec_parser import parse_result_html
+
+FIXTURE = os.path.join(FIXTURE_DIR, "vccp09_2600.html")
+
+
+@pytest.fixture(scope="module")
+def fixture_html():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("scale", [1, 50])
+def test_lxml_parser_matches_bs4_parser(fixture_html, scale):
+    html = scale_fixture(fixture_html, scale)
+    expected = parse_result_html_bs4(html, BENCH_TIMESTAMP)
+    actual = parse_result_html(html, BENCH_TIMESTAMP)
+    actual.pop("table") # 기존 구현에는 없는 정수형 열 단위 테이블
+    assert actual == expected
+
+
+def test_scaled_fixture_has_more_rows(fixture_html):
+    recorded = parse_result_html(fixture_html, BENCH_TIMESTAMP)
+    scaled = parse_result_html(scale_fixture(fixture_html, 50), BENCH_TIMESTAMP)
+    assert len(scaled["data"]) == 50 * len(recorded["data"])
+    assert len(scaled["table"]["rows"]) == len(scaled["data"])
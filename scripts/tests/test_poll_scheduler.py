@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from poll_scheduler import IDLE_GROWTH, AdaptivePollScheduler, region_turnouts
+
+
+def _scheduler(jitter=0.0, seed=0):
+    return AdaptivePollScheduler(min_interval=15.0, max_interval=300.0, jitter=jitter, rng=random.Random(seed))
+
+
+def test_invalid_interval_range_is_rejected():
+    with pytest.raises(ValueError):
+        AdaptivePollScheduler(min_interval=0)
+    with pytest.raises(ValueError):
+        AdaptivePollScheduler(min_interval=60, max_interval=30)
+
+
+def test_interval_follows_turnout_rate():
+    scheduler = _scheduler()
+    assert scheduler.record_success({"2600": 10.0}, 5, now=0.0) == 15.0 # 첫 tick은 속도를 알 수 없어 간격 유지
+    assert scheduler.record_success({"2600": 11.0}, 5, now=100.0) == 50.0 # 0.01%p/초 -> 0.5%p에 50초
+    assert scheduler.record_success({"2600": 21.0}, 5, now=110.0) == 15.0 # 1%p/초 -> 최소 간격
+    assert scheduler.record_success({"2600": 21.1, "1100": 3.0}, 5, now=410.0) == 300.0 # 느리면 최대 간격까지
+
+
+def test_fastest_region_sets_the_rate():
+    scheduler = _scheduler()
+    scheduler.record_success({"2600": 10.0, "1100": 10.0}, 5, now=0.0)
+    assert scheduler.record_success({"2600": 10.5, "1100": 12.5}, 5, now=100.0) == 20.0
+
+
+def test_changed_rows_without_turnout_progress_keep_the_interval():
+    scheduler = _scheduler()
+    scheduler.interval = 40.0
+    scheduler.record_success({"2600": 10.0}, 0, now=0.0)
+    assert scheduler.interval == 40.0 * IDLE_GROWTH
+    assert scheduler.record_success({"2600": 10.0}, 3, now=60.0) == 40.0 * IDLE_GROWTH
+
+
+def test_idle_ticks_grow_to_the_maximum():
+    scheduler = _scheduler()
+    intervals = [scheduler.record_success({"2600": 10.0}, 0, now=float(tick)) for tick in range(12)]
+    assert intervals[:3] == [22.5, 33.75, 50.625]
+    assert intervals[-1] == 300.0
+    assert intervals == sorted(intervals)
+
+
+def test_failures_double_the_delay_until_success():
+    scheduler = _scheduler()
+    scheduler.record_success({"2600": 10.0}, 0, now=0.0)
+    assert [scheduler.record_failure() for _ in range(7)] == [15.0, 30.0, 60.0, 120.0, 240.0, 300.0, 300.0]
+    assert scheduler.next_delay() == 300.0
+    scheduler.record_success({"2600": 10.0}, 2, now=10.0)
+    assert scheduler.consecutive_errors == 0
+    assert scheduler.next_delay() == 22.5
+
+
+def test_next_delay_applies_seeded_jitter():
+    scheduler = _scheduler(jitter=0.1, seed=42)
+    expected_rng = random.Random(42)
+    scheduler.interval = 100.0
+    delays = [scheduler.next_delay() for _ in range(20)]
+    assert delays == [100.0 * expected_rng.uniform(0.9, 1.1) for _ in range(20)]
+    assert all(90.0 <= delay <= 110.0 for delay in delays)
+
+
+def test_jitter_never_leaves_the_interval_range():
+    scheduler = _scheduler(jitter=0.5, seed=1)
+    assert all(15.0 <= scheduler.next_delay() <= 300.0 for _ in range(100))
+    scheduler.interval = 300.0
+    assert all(15.0 <= scheduler.next_delay() <= 300.0 for _ in range(100))
+
+
+def test_failing_region_backs_off_alone():
+    scheduler = _scheduler(jitter=0.1)
+    codes = ["2600", "1100"]
+    scheduler.record_regions({"2600": {}}, {"1100": "timeout"}, now=0.0)
+    assert scheduler.region_retry_at["1100"] == pytest.approx(13.5) # 15초 x (1 - jitter)
+    assert scheduler.due_regions(codes, now=10.0) == ["2600"]
+    assert scheduler.due_regions(codes, now=13.5) == codes
+
+    scheduler.record_regions({"2600": {}}, {"1100": "timeout"}, now=15.0)
+    assert scheduler.due_regions(codes, now=40.0) == ["2600"] # 두 번째 실패는 30초 x 0.9
+    assert scheduler.due_regions(codes, now=42.0) == codes
+
+    scheduler.record_regions({"2600": {}, "1100": {}}, {}, now=45.0)
+    assert scheduler.region_errors == {} and scheduler.region_retry_at == {}
+    assert scheduler.consecutive_errors == 0 # 지역별 백오프는 전체 백오프와 별개
+
+
+def test_backoff_remaining_only_when_every_region_is_backing_off():
+    scheduler = _scheduler()
+    codes = ["2600", "1100"]
+    assert scheduler.backoff_remaining(codes, now=0.0) is None
+    scheduler.record_regions({}, {"2600": "timeout"}, now=0.0)
+    assert scheduler.backoff_remaining(codes, now=1.0) is None # 1100은 수집 가능
+    scheduler.record_regions({}, {"1100": "timeout", "2600": "timeout"}, now=5.0)
+    assert scheduler.backoff_remaining(codes, now=5.0) == 15.0 # 1100 (첫 실패) 15초, 2600 (두 번째) 30초
+    assert scheduler.backoff_remaining(codes, now=19.0) == 1.0
+    assert scheduler.backoff_remaining(codes, now=20.0) is None
+    assert scheduler.backoff_remaining([], now=0.0) is None
+
+
+def test_all_counted():
+    scheduler = _scheduler()
+    assert not scheduler.all_counted([])
+    scheduler.record_success({"2600": 100.0}, 1, now=0.0)
+    assert scheduler.all_counted(["2600"])
+    assert not scheduler.all_counted(["2600", "1100"])
+    scheduler.record_success({"1100": 99.9}, 1, now=10.0)
+    assert not scheduler.all_counted(["2600", "1100"])
+    scheduler.record_success({"1100": 100.0}, 1, now=20.0)
+    assert scheduler.all_counted(["2600", "1100"])
+
+
+def test_region_turnouts_prefer_the_typed_table():
+    regions = {
+        "2600": {"table": {"summary": {"turnout": 42.5}}, "summary": {"개표율": "10.0%"}},
+        "1100": {"summary": {"개표율": "37.25%"}},
+        "2700": {"summary": {"개표율": "-"}},
+    }
+    assert region_turnouts(regions) == {"2600": 42.5, "1100": 37.25}
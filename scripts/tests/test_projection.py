@@ -0,0 +1,114 @@
+import numpy as np
+
+from projection import (
+    ProjectionAccumulator, ProjectionInputs, analytic_intervals, build_projection_inputs, project_votes,
+    variance_terms,
+)
+
+CANDIDATES = ["가", "나", "다"]
+
+
+def _row(name, eligible, cast, invalid, *votes):
+    row = {"구시군명": name, "선거인수": f"{eligible:,}", "투표수": f"{cast:,}", "무효투표수": str(invalid)}
+    row.update({cand: f"{count:,}" for cand, count in zip(CANDIDATES, votes)})
+    return row
+
+
+def _region(rows, candidates=CANDIDATES):
+    return {"candidates": list(candidates), "data": rows}
+
+
+def _assert_matches_full(accumulator, scraped_data):
+    inputs = build_projection_inputs(scraped_data)
+    expected, expected_invalid = project_votes(inputs)
+    projected, invalid, eligible, variance = accumulator.projection()
+    np.testing.assert_allclose(projected, expected, rtol=1e-12)
+    np.testing.assert_allclose(variance, variance_terms(inputs).sum(axis=0), rtol=1e-9)
+    assert abs(invalid - expected_invalid) < 1e-6
+    assert eligible == int(inputs.eligible[inputs.valid].sum())
+
+
+def test_reset_matches_full_projection():
+    data = _region([_row("중구", 40_000, 1_000, 10, 500, 400, 90), _row("서구", 90_000, 3_000, 30, 1_000, 1_800, 170)])
+    accumulator = ProjectionAccumulator()
+    accumulator.reset(data)
+    _assert_matches_full(accumulator, data)
+
+
+def test_incremental_updates_match_full_projection():
+    rows = {
+        "중구": _row("중구", 40_000, 1_000, 10, 500, 400, 90),
+        "서구": _row("서구", 90_000, 3_000, 30, 1_000, 1_800, 170),
+        "동구": _row("동구", 70_000, 0, 0, 0, 0, 0),
+    }
+    accumulator = ProjectionAccumulator()
+    accumulator.reset(_region(list(rows.values())))
+
+    rows["동구"] = _row("동구", 70_000, 2_000, 20, 900, 900, 180)
+    rows["중구"] = _row("중구", 40_000, 5_000, 50, 2_500, 2_000, 450)
+    assert accumulator.apply(CANDIDATES, [rows["동구"], rows["중구"]]) == 2
+    _assert_matches_full(accumulator, _region(list(rows.values())))
+
+    del rows["서구"]
+    accumulator.apply(CANDIDATES, [], removed_names=["서구"])
+    _assert_matches_full(accumulator, _region(list(rows.values())))
+
+
+def test_unparsable_row_counts_toward_eligible_only():
+    rows = [_row("중구", 40_000, 1_000, 10, 500, 400, 90), dict(_row("서구", 90_000, 3_000, 30, 1_000, 1_800, 170), 가="-")]
+    accumulator = ProjectionAccumulator()
+    accumulator.reset(_region(rows))
+    _assert_matches_full(accumulator, _region(rows))
+    assert accumulator.eligible_total == 130_000
+
+
+def test_rebase_keeps_totals():
+    accumulator = ProjectionAccumulator()
+    accumulator.REBASE_EVERY = 5
+    rows = [_row(f"구{i}", 10_000 + i, 1_000, 10, 300 + i, 400, 290 - i) for i in range(4)]
+    accumulator.reset(_region(rows))
+    for step in range(12):
+        rows[step % 4] = _row(f"구{step % 4}", 10_000, 1_000 + step, 10, 300 + step, 400, 290)
+        accumulator.apply(CANDIDATES, [rows[step % 4]])
+    assert accumulator.updates_since_rebase < accumulator.REBASE_EVERY
+    _assert_matches_full(accumulator, _region(rows))
+
+
+def test_candidate_added_mid_count():
+    rows = [_row("중구", 40_000, 1_000, 10, 500, 400, 90)]
+    accumulator = ProjectionAccumulator()
+    accumulator.reset(_region(rows, CANDIDATES[:2]))
+    accumulator.apply(CANDIDATES, rows)
+    _assert_matches_full(accumulator, _region(rows))
+
+
+def _synthetic_inputs(n_rows, n_cands, seed=1):
+    rng = np.random.default_rng(seed)
+    eligible = rng.integers(5_000, 50_000, n_rows)
+    cast = (eligible * 0.7).astype(np.int64)
+    counted = (cast * rng.uniform(0.05, 1.0, n_rows)).astype(np.int64)
+    shares = rng.dirichlet(np.ones(n_cands + 1), n_rows)
+    categories = np.array([rng.multinomial(n, p) for n, p in zip(counted, shares)])
+    return ProjectionInputs(
+        [f"구{i}" for i in range(n_rows)], [f"후보{j}" for j in range(n_cands)], categories[:, :n_cands],
+        eligible, cast, categories[:, n_cands], np.ones(n_rows, dtype=bool), np.ones(n_rows, dtype=bool),
+    )
+
+
+def test_analytic_intervals_bracket_projection():
+    inputs = _synthetic_inputs(3_000, 8)
+    lower, upper = analytic_intervals(inputs)
+    projected, _ = project_votes(inputs)
+    assert np.all(lower < projected) and np.all(projected < upper)
+
+
+def test_fully_counted_rows_have_no_interval_width():
+    data = _region([_row("중구", 40_000, 1_000, 0, 600, 300, 100)])
+    lower, upper = analytic_intervals(build_projection_inputs(data))
+    np.testing.assert_array_equal(lower, upper)
+
+
+def test_analytic_intervals_without_counted_rows_collapse_to_projection():
+    data = _region([_row("중구", 40_000, 0, 0, 0, 0, 0)])
+    lower, upper = analytic_intervals(build_projection_inputs(data))
+    np.testing.assert_array_equal(lower, upper)
@@ -0,0 +1,69 @@
+import json
+import os
+
+import fakeredis
+import pytest
+
+import redis_store
+import scrape_push
+from nec_parser import parse_result_html, table_from_entries
+from wire_format import decode, legacy_region
+
+SETTINGS = ("localhost", "6379", "secret")
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "vccp09_2600.html")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = fakeredis.FakeRedis()
+    monkeypatch.setattr(redis_store, "get_redis_client", lambda *args, **kwargs: fake)
+    return fake
+
+
+@pytest.fixture(scope="module")
+def fixture_html():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return f.read()
+
+
+def _stored(client, key):
+    return json.loads(client.get(key))
+
+
+def test_table_from_entries_matches_parsed_table(fixture_html):
+    parsed = parse_result_html(fixture_html, "2026-06-03T12:00:00+00:00")
+    legacy = legacy_region(parsed)
+    assert table_from_entries(legacy["candidates"], legacy["summary"], legacy["data"]) == parsed["table"]
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_failed_region_keeps_last_good_data(client, fixture_html, use_cache):
+    first = {code: parse_result_html(fixture_html, "t1") for code in ("2600", "1100")}
+    last_regions = {} if use_cache else None
+    state = scrape_push.publish_results(
+        scrape_push.build_region_snapshot("t1", ["2600", "1100"], first, {}), SETTINGS, last_regions=last_regions
+    )
+
+    changed = parse_result_html(fixture_html.replace("305,699", "305,700"), "t2")
+    scrape_push.publish_results(
+        scrape_push.build_region_snapshot("t2", ["2600", "1100"], {"2600": changed}, {"1100": "timeout"}),
+        SETTINGS, state, last_regions=last_regions,
+    )
+
+    raw = _stored(client, scrape_push.RAW_DATA_BY_REGION_REDIS_KEY)
+    assert raw["failed_regions"] == {"1100": "timeout"}
+    assert raw["regions"]["1100"]["stale"] is True
+    assert raw["regions"]["1100"]["data"] == first["1100"]["data"]
+    assert "stale" not in raw["regions"]["2600"]
+    projected = _stored(client, scrape_push.PROJECTED_DATA_BY_REGION_REDIS_KEY)
+    assert projected["regions"]["1100"]["stale"] is True
+    wire = decode(client.get(scrape_push.WIRE_DATA_REDIS_KEY))
+    assert wire["regions"]["1100"]["stale"] is True
+    assert wire["regions"]["1100"]["eligible"] == first["1100"]["table"]["eligible"]
+
+
+def test_failed_region_without_previous_data_is_left_out(client, fixture_html):
+    regions = {"2600": parse_result_html(fixture_html, "t1")}
+    scrape_push.publish_results(scrape_push.build_region_snapshot("t1", ["2600", "1100"], regions, {"1100": "timeout"}), SETTINGS)
+    raw = _stored(client, scrape_push.RAW_DATA_BY_REGION_REDIS_KEY)
+    assert list(raw["regions"]) == ["2600"]
@@ -0,0 +1,136 @@
+import fakeredis
+import pytest
+import redis
+
+import redis_store
+from redis_store import push_many_to_upstash_redis
+
+SETTINGS = ("localhost", "6379", "secret")
+
+
+class FlakyPipeline:
+    """fakeredis 파이프라인을 감싸 execute()마다 준비된 오류를 (적용 전 또는 적용 후에) 던집니다."""
+
+    def __init__(self, client, pipe):
+        self.client = client
+        self.pipe = pipe
+
+    def __enter__(self):
+        self.pipe.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self.pipe.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self.pipe, name)
+
+    def execute(self):
+        self.client.executions += 1
+        error, after_exec = self.client.failures.pop(0) if self.client.failures else (None, False)
+        if error and not after_exec:
+            self.pipe.reset()
+            raise error
+        result = self.pipe.execute()
+        if error:
+            raise error
+        return result
+
+
+class FlakyClient:
+    def __init__(self, failures=()):
+        self.redis = fakeredis.FakeRedis()
+        self.failures = list(failures)
+        self.executions = 0
+        self.transactions = []
+
+    def pipeline(self, transaction=True):
+        self.transactions.append(transaction)
+        return FlakyPipeline(self, self.redis.pipeline(transaction=transaction))
+
+    def __getattr__(self, name):
+        return getattr(self.redis, name)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep(monkeypatch):
+    monkeypatch.setattr(redis_store.time, "sleep", lambda seconds: None)
+
+
+def _subscribe(client, channel):
+    pubsub = client.redis.pubsub()
+    pubsub.subscribe(channel)
+    pubsub.get_message(timeout=1)
+    return pubsub
+
+
+def test_push_writes_all_keys_in_one_transaction():
+    client = FlakyClient()
+    pubsub = _subscribe(client, "updates")
+
+    push_many_to_upstash_redis(
+        {"raw": {"a": 1}, "projected": {"b": 2}, "encoded": b"\x00\x01"}, *SETTINGS, client=client,
+        stream_entries=[("history", {"payload": "x"}, 100, "1000-1")],
+        notifications=[("updates", "v1")],
+    )
+
+    assert client.transactions == [True]
+    assert client.executions == 1
+    assert client.redis.get("raw") == b'{"a": 1}'
+    assert client.redis.get("projected") == b'{"b": 2}'
+    assert client.redis.get("encoded") == b"\x00\x01"
+    assert [entry_id for entry_id, _ in client.redis.xrange("history")] == [b"1000-1"]
+    assert pubsub.get_message(timeout=1)["data"] == b"v1"
+
+
+def test_push_skips_empty_values():
+    client = FlakyClient()
+    push_many_to_upstash_redis({"raw": {"a": 1}, "projected": None}, *SETTINGS, client=client)
+    assert client.redis.get("raw") is not None
+    assert client.redis.exists("projected") == 0
+
+
+def test_push_retries_transient_errors():
+    client = FlakyClient(failures=[(redis.exceptions.ConnectionError("reset"), False), (redis.exceptions.TimeoutError("slow"), False)])
+    push_many_to_upstash_redis({"raw": {"a": 1}}, *SETTINGS, client=client)
+    assert client.executions == 3
+    assert client.redis.get("raw") == b'{"a": 1}'
+
+
+def test_push_gives_up_after_retries():
+    failures = [(redis.exceptions.ConnectionError("down"), False)] * (redis_store.PUSH_RETRIES + 1)
+    client = FlakyClient(failures=failures)
+    with pytest.raises(redis.exceptions.ConnectionError):
+        push_many_to_upstash_redis({"raw": {"a": 1}}, *SETTINGS, client=client)
+    assert client.executions == redis_store.PUSH_RETRIES + 1
+    assert client.redis.exists("raw") == 0
+
+
+def test_push_does_not_retry_other_errors():
+    client = FlakyClient(failures=[(redis.exceptions.ResponseError("WRONGTYPE"), False)])
+    with pytest.raises(redis.exceptions.ResponseError):
+        push_many_to_upstash_redis({"raw": {"a": 1}}, *SETTINGS, client=client)
+    assert client.executions == 1
+
+
+def test_push_does_not_resend_a_transaction_applied_before_the_error():
+    client = FlakyClient(failures=[(redis.exceptions.ConnectionError("reset after EXEC"), True)])
+    pubsub = _subscribe(client, "updates")
+
+    push_many_to_upstash_redis(
+        {"raw": {"a": 1}}, *SETTINGS, client=client,
+        stream_entries=[("history", {"payload": "x"}, 100, "1000-1")],
+        notifications=[("updates", "v1")],
+    )
+
+    assert client.executions == 1
+    assert client.redis.xlen("history") == 1
+    assert pubsub.get_message(timeout=1)["data"] == b"v1"
+    assert pubsub.get_message(timeout=0.1) is None
+
+
+def test_push_with_unmarked_notifications_is_not_retried():
+    client = FlakyClient(failures=[(redis.exceptions.ConnectionError("reset"), False)])
+    with pytest.raises(redis.exceptions.ConnectionError):
+        push_many_to_upstash_redis({"raw": {"a": 1}}, *SETTINGS, client=client, notifications=[("updates", "v1")])
+    assert client.executions == 1
@@ -0,0 +1,15 @@
+import wire_format
+from wire_format import decode, encode, usable_codec
+
+
+def test_unusable_codec_falls_back_to_zjson(monkeypatch):
+    monkeypatch.setattr(wire_format, "msgpack", None)
+    assert usable_codec("msgpack") == "zjson"
+    assert usable_codec("protobuf") == "zjson"
+    assert usable_codec("json") == "json"
+    assert usable_codec("zjson") == "zjson"
+
+
+def test_zjson_round_trip():
+    snapshot = {"v": 2, "regions": {"2600": {"rows": ["중구"], "votes": [[1, 2]]}}}
+    assert decode(encode(snapshot, "zjson")) == snapshot
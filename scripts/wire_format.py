@@ -0,0 +1,111 @@
+import json
+import zlib
+
+try:
+    import msgpack
+except ImportError: # msgpack 코덱을 쓰지 않으면 필요 없음
+    msgpack = None
+
+# --- 버전이 붙은 열 단위(columnar) 전송 형식 ---
+# 한글 컬럼명 키 + "1,234,567" 문자열 대신, 파싱 시점에 정수로 바꾼 배열을 그대로 보냅니다.
+# v2 스냅샷: {"v": 2, "timestamp", "version", "failed_regions",
+#            "regions": {지역코드: {"candidates", "rows", "eligible", "cast", "candidate_total", "invalid",
+#                                   "abstentions", "turnout", "votes", "summary", "projected", ["stale"]}}}
+# 이번 수집에서 실패한 지역은 직전 데이터를 "stale": true와 함께 그대로 싣습니다 (failed_regions에도 남음).
+# 코덱: "json"(평문 JSON 문자열), "zjson"(zlib 압축 JSON), "msgpack"(msgpack + zlib, msgpack 설치 시)
+# 바이너리 코덱은 MAGIC + 형식 버전 1바이트 + 코덱 1바이트 헤더를 앞에 붙입니다.
+
+WIRE_FORMAT_VERSION = 2
+MAGIC = b"PCL"
+_CODEC_IDS = {"zjson": 1, "msgpack": 2}
+_CODEC_NAMES = {codec_id: name for name, codec_id in _CODEC_IDS.items()}
+
+
+def legacy_region(region_data):
+    """기존 키에 저장하던 형태(표시 문자열 dict)만 남긴 지역 데이터."""
+    return {key: value for key, value in region_data.items() if key != "table"}
+
+
+def _compact_projection(final_results):
+    if not final_results:
+        return None
+    compact = {
+        "votes": list(final_results["projected_votes_by_candidate"].values()),
+        "invalid": final_results["projected_invalid_votes"],
+        "eligible_total": final_results["calculation_info"]["total_eligible_voters_used_for_projection"],
+        "turnout": final_results["overall_turnout_rate_percent"],
+    }
+    intervals = final_results.get("confidence_intervals")
+    if intervals:
+        compact["ci"] = {
+            "method": intervals["method"],
+            "level": intervals["level"],
+            "bounds": list(intervals["by_candidate"].values()),
+        }
+    return compact
+
+
+def build_wire_snapshot(region_snapshot, projected_by_region):
+    """지역별 스냅샷과 계산 결과를 v2 열 단위 형식으로 합칩니다. "table"이 없는 지역은 제외합니다."""
+    regions = {}
+    for city_code, region_data in region_snapshot.get("regions", {}).items():
+        table = region_data.get("table")
+        if not table:
+            continue
+        regions[city_code] = dict(table, projected=_compact_projection(projected_by_region.get(city_code)))
+        if region_data.get("stale"):
+            regions[city_code]["stale"] = True
+    return {
+        "v": WIRE_FORMAT_VERSION,
+        "timestamp": region_snapshot.get("timestamp"),
+        "version": region_snapshot.get("version"),
+        "failed_regions": region_snapshot.get("failed_regions", {}),
+        "regions": regions,
+    }
+
+
+def usable_codec(codec):
+    """설정된 코덱을 쓸 수 없으면(알 수 없는 이름, msgpack 미설치) 경고를 출력하고 "zjson"을 반환합니다."""
+    if codec == "msgpack" and msgpack is None:
+        print("Warning: WIRE_FORMAT_CODEC=msgpack but the msgpack package is not installed. Falling back to zjson.")
+        return "zjson"
+    if codec != "json" and codec not in _CODEC_IDS:
+        print(f"Warning: Unknown WIRE_FORMAT_CODEC '{codec}'. Expected one of: json, {', '.join(_CODEC_IDS)}. Falling back to zjson.")
+        return "zjson"
+    return codec
+
+
+def encode(wire_snapshot, codec="zjson"):
+    """codec에 따라 str(json) 또는 bytes(zjson/msgpack)로 인코딩합니다."""
+    if codec == "json":
+        return json.dumps(wire_snapshot, ensure_ascii=False, separators=(",", ":"))
+    if codec == "zjson":
+        body = json.dumps(wire_snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    elif codec == "msgpack":
+        if msgpack is None:
+            raise ValueError("msgpack codec requested but the msgpack package is not installed.")
+        body = msgpack.packb(wire_snapshot, use_bin_type=True)
+    else:
+        raise ValueError(f"Unknown wire codec '{codec}'. Expected one of: json, {', '.join(_CODEC_IDS)}")
+    header = MAGIC + bytes([WIRE_FORMAT_VERSION, _CODEC_IDS[codec]])
+    return header + zlib.compress(body, 9)
+
+
+def decode(payload):
+    """encode()의 결과(또는 Redis에서 읽은 bytes)를 dict로 되돌립니다."""
+    if isinstance(payload, str):
+        return json.loads(payload)
+    if not payload.startswith(MAGIC):
+        return json.loads(payload.decode("utf-8"))
+    version, codec_id = payload[len(MAGIC)], payload[len(MAGIC) + 1]
+    if version != WIRE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported wire format version {version}")
+    body = zlib.decompress(payload[len(MAGIC) + 2:])
+    codec = _CODEC_NAMES.get(codec_id)
+    if codec == "zjson":
+        return json.loads(body.decode("utf-8"))
+    if codec == "msgpack":
+        if msgpack is None:
+            raise ValueError("Payload is msgpack-encoded but the msgpack package is not installed.")
+        return msgpack.unpackb(body, raw=False)
+    raise ValueError(f"Unknown wire codec id {codec_id}")
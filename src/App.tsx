@@ -10,8 +10,17 @@ export default function App() {
   useEffect(() => {
     const load = async () => setTot(await fetchTotals('/data/2022_result.csv'));
     load();                            // 최초
-    const id = setInterval(load, 60_000); // 1분 주기
-    return () => clearInterval(id);
+    const id = setInterval(load, 60_000); // 1분 주기 (중계 서버가 없거나 끊겼을 때 대비)
+
+    // scripts/live_relay.py 주소가 설정돼 있으면 저장 알림을 받을 때마다 바로 갱신
+    const relayUrl = import.meta.env.VITE_LIVE_RELAY_URL as string | undefined;
+    const events = relayUrl ? new EventSource(relayUrl) : null;
+    if (events) events.onmessage = () => load();
+
+    return () => {
+      clearInterval(id);
+      events?.close();
+    };
   }, []);
 
   return (